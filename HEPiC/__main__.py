@@ -14,12 +14,12 @@ if __name__ == "__main__" and not __package__ and "__compiled__" not in globals(
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QStackedWidget, QLabel
 )
-from PySide6.QtCore import Signal, Slot, QThread, QTimer
+from PySide6.QtCore import Qt, Signal, Slot, QThread, QTimer
 import pyqtgraph as pg
-from collections import deque
 from .communications import TCPClient, KlipperWorker, ConnectionTester
-from .vision import VideoWorker, ProcessingWorker, IRWorker, VideoRecorder
+from .vision import VideoWorker, ProcessingWorker, IRWorker, VideoRecorder, OPTRIS_LIB_LOADED
 from .tab_widgets import ConnectionWidget, VisionPageWidget, GcodeWidget, HomeWidget, IRPageWidget, JobSequenceWidget, DataProcessorWidget, QualityCheckWidget
+from .utils import RingBuffer, open_autosave_writer
 from .app_config import (
     build_main_window_stylesheet,
     find_app_file,
@@ -27,16 +27,24 @@ from .app_config import (
 )
 from . import __app_name__, __version__
 import asyncio
-import csv
+import importlib.util
+from operator import attrgetter
 import threading
 import time
 from qasync import asyncSlot, QEventLoop
 import numpy as np
-from datetime import datetime
 import logging
 import argparse
 
 
+# items recorded at every tick regardless of which sensors are connected
+_BASE_DATA_ITEMS = (
+    "time_s",
+    "temperature_C",
+    "feedrate_mms",
+    "measured_temperature_C",
+    "measured_feedrate_mms",
+)
 
 
 def _show_startup_error(exc):
@@ -88,8 +96,8 @@ class _DataCollectorThread(threading.Thread):
 # ====================================================================
 class MainWindow(QMainWindow):
     
-    sigNewData = Signal(dict) # update data plot
-    sigNewStatus = Signal(dict) # update status panel
+    sigNewData = Signal(list, object) # update data plot, carries (columns, rows appended since last emit)
+    sigNewStatus = Signal(object) # update status panel, carries the data_status dict by reference (read-only)
     sigProgress = Signal(float)
     sigFilePosition = Signal(int)
     sigEmergencyStop = Signal()
@@ -112,13 +120,25 @@ class MainWindow(QMainWindow):
         )
         pg.setConfigOption("background", self.background_color)
         pg.setConfigOption("foreground", self.foreground_color)
+        pg.setConfigOption("antialias", False)
+        if self.plot_use_opengl:
+            # must be set before any plot widget is created
+            try:
+                import OpenGL  # noqa: F401  pyqtgraph needs PyOpenGL for its GL path
+                pg.setConfigOption("useOpenGL", True)
+                pg.setConfigOption("enableExperimental", True)
+            except ImportError:
+                self.logger.warning("plot_use_opengl is set but PyOpenGL is not installed; using the raster plot path.")
+        if importlib.util.find_spec("numba") is not None:
+            # pyqtgraph imports numba lazily on first use for its curve path and image rescale kernels
+            pg.setConfigOption("useNumba", True)
 
         # 1. (关键) 给主窗口设置一个唯一的对象名称
         self.setObjectName("MyMainWindow") 
 
         self.initUI()
         self._data_thread: _DataCollectorThread | None = None
-        self._csv_lock = threading.Lock()
+        self._autosave_lock = threading.Lock()
         self.status_timer = QTimer(self) # set status panel update frequency
         self.status_timer.timeout.connect(self.on_status_timer_tick)
         self._display_data_timer = QTimer(self) # UI plot refresh, decoupled from data rate
@@ -131,8 +151,7 @@ class MainWindow(QMainWindow):
         self.hikcam_ok = False
         self.init_data()
         
-        self._csv_file = None
-        self._csv_writer = None
+        self._autosave_writer = None
         self.worker = None
         self.klipper_worker = None
         self.video_worker = None
@@ -145,6 +164,9 @@ class MainWindow(QMainWindow):
         self.IR_WORKER_OK = False
 
         self.frame_size = (512, 512)
+        self._last_display_frames = {}
+        self._last_progress = None # last values sent by on_status_timer_tick, to skip unchanged emits
+        self._last_file_position = None
     
     def load_config(self):
         self.config = load_app_config(self.config_file)
@@ -161,6 +183,8 @@ class MainWindow(QMainWindow):
         self.final_data_maxlen = self.config.get("final_data_maxlen", 1000000)
         self.klipper_query_delay = self.config.get("klipper_query_delay", 0.1)
         self.plot_time_window_s = self.config.get("plot_time_window_s", 60)
+        self.plot_use_opengl = self.config.get("plot_use_opengl", False)
+        self.autosave_format = self.config.get("autosave_format", "csv") # "csv" or "arrow" (requires pyarrow)
 
         # color scheme
         self.background_color = self.config.get("background_color", "black")
@@ -179,7 +203,10 @@ class MainWindow(QMainWindow):
         self.tabs.setMovable(True) # 让标签页可以拖动排序
         # 标签页们
         self.connection_widget = ConnectionWidget(host=self.host)  
-        self.home_widget = HomeWidget(time_window_s=self.plot_time_window_s)
+        self.home_widget = HomeWidget(
+            time_window_s=self.plot_time_window_s,
+            max_points=int(self.plot_time_window_s * self.data_frequency * 2),
+        )
         self.vision_page_widget = VisionPageWidget()
         self.status_widget = self.home_widget.status_widget
         self.ir_page_widget = IRPageWidget()
@@ -216,6 +243,7 @@ class MainWindow(QMainWindow):
         self.sigNewStatus.connect(self.status_widget.update_display)
         self.sigFilePosition.connect(self.job_sequence_widget.gcode_widget.update_file_position)
         self.job_sequence_widget.gcode_widget.sigFilePath.connect(lambda _: self.tabs.setCurrentIndex(0))
+        self.job_sequence_widget.gcode_widget.sigFilePath.connect(self._on_gcode_file_changed)
         
         # --- 质检模式的材料属性会在第一次显示时自动初始化 ---
 
@@ -233,33 +261,52 @@ class MainWindow(QMainWindow):
         self.statusBar().addPermanentWidget(self.material_db_label)
 
     def init_data(self):
-        """Initiate a few temperary queues for the data. This will be the pool for the final data: at each tick of the timer, one number will be taken out of the pool, forming a row of a spread sheet and saved."""
-        self._session_start = time.monotonic()
+        """Initiate the data pool. `self.data` is a column-oriented ring buffer: at each tick of the data collector, one row (one number per item) is appended to it, and the same row is written to the autosave file when recording."""
+        self._session_start = time.perf_counter() # same clock as the collector schedule
         existing_sensor_items = list(getattr(self, "sensor_data_items", []))
-        self.base_data_items = [
-            "time_s",
-            "temperature_C",
-            "feedrate_mms",
-            "measured_temperature_C",
-            "measured_feedrate_mms",
-        ]
+        self.base_data_items = _BASE_DATA_ITEMS
         self.sensor_data_items = existing_sensor_items
         items = list(self.base_data_items) + list(self.sensor_data_items)
-        self.data = {}
-        self.data_status = {} # only stores current status of the platform
-
-        for item in items:
-            self.data[item] = deque(maxlen=self.config.get("final_data_maxlen", 1000000))
-            self.data_status[item] = np.nan
+        self.data = RingBuffer(items, self.final_data_maxlen)
+        self._display_cursor = 0 # self.data.total at the last sigNewData
+        self.data_status = dict.fromkeys(items, np.nan) # only stores current status of the platform
+        self._build_status_plan()
         if hasattr(self, "home_widget"):
+            self.home_widget.data_widget.clear_data()
             self.home_widget.data_widget.set_sensor_items(self.sensor_data_items)
 
     def _ensure_data_keys(self, items):
         for item in items:
-            if item not in self.data:
-                self.data[item] = deque(maxlen=self.final_data_maxlen)
             if item not in self.data_status:
                 self.data_status[item] = np.nan
+        if self.data.add_columns(items):
+            self._build_status_plan()
+
+    def _build_status_plan(self):
+        """Bind one getter per data column, in column order, so that grab_status() does no string dispatch per tick. Each getter receives the main window; worker attributes are read with `operator.attrgetter`, which resolves the dotted path in C and always follows the current worker. Call again whenever columns are added or a camera worker comes up."""
+        sensor_getter = lambda name: (lambda window: window._sensors.get(name, np.nan))
+        fixed_getters = {
+            "time_s": lambda window: time.perf_counter() - window._session_start,
+            "temperature_C": attrgetter("klipper_worker.target_hotend_temperature"),
+            "feedrate_mms": attrgetter("klipper_worker.active_feedrate_mms"),
+            "measured_temperature_C": attrgetter("klipper_worker.hotend_temperature"),
+            "measured_feedrate_mms": sensor_getter("measured_feedrate_mms"),
+        }
+
+        plan = []
+        for item in self.data.columns:
+            if item in fixed_getters:
+                getter = fixed_getters[item]
+            elif item == "die_temperature_C" and getattr(self, "ir_worker", None):
+                getter = attrgetter("ir_worker.die_temperature")
+            elif item == "die_diameter_px" and getattr(self, "processing_worker", None):
+                getter = attrgetter("processing_worker.die_diameter")
+            elif item in self.sensor_data_items:
+                getter = sensor_getter(item)
+            else:
+                getter = lambda window: np.nan
+            plan.append((item, getter))
+        self._status_plan = tuple(plan)
 
     def _register_sensor_items(self, items, sensor_labels: dict | None = None):
         added = False
@@ -329,7 +376,8 @@ class MainWindow(QMainWindow):
         self.home_widget.command_widget.command.connect(self.klipper_worker.send_gcode)
 
         self.sigEmergencyStop.connect(self.klipper_worker.emergency_stop)
-        self.sigProgress.connect(self.status_widget.update_progress)
+        # both ends outlive a reconnect, connect only once
+        self.sigProgress.connect(self.status_widget.update_progress, Qt.ConnectionType.UniqueConnection)
         self.job_sequence_widget.gcode_widget.sigFilePath.connect(self.klipper_worker.upload_gcode_to_klipper)
         self.job_sequence_widget.gcode_widget.sigActiveGcode.connect(self.klipper_worker.set_active_gcode)
         self.home_widget.sigExtrude.connect(self.klipper_worker.send_gcode)
@@ -344,13 +392,13 @@ class MainWindow(QMainWindow):
 
         await asyncio.gather(tcp_task, klipper_task)
 
-    @asyncSlot(str)
-    async def on_quality_check_gcode_requested(self, gcode: str):
+    @Slot(str)
+    def on_quality_check_gcode_requested(self, gcode: str):
         """Send the quality-check startup G-code through Klipper when available."""
         if not getattr(self, "klipper_worker", None):
             self.logger.warning("Quality check startup G-code requested before klipper_worker is ready")
             return
-        await self.klipper_worker.send_gcode(gcode)
+        self.klipper_worker.send_gcode(gcode)
 
     @Slot(str)
     def handle_gcode_response(self, response: str):
@@ -438,24 +486,31 @@ class MainWindow(QMainWindow):
         self.logger.info("All zeroable sensors zeroed via G-code action.")
 
     def _refresh_displays(self):
-        """Poll shared frame buffers and update all video display widgets."""
+        """Poll shared frame buffers and update all video display widgets. This single timer slot is the only fan-out point from the camera workers to the GUI; frames that have not changed since the last tick are skipped so a stalled source costs no texture uploads."""
         if self.video_worker:
             frame = self.video_worker.get_latest_frame()
-            if frame is not None:
+            if self._is_new_frame("video", frame):
                 self.vision_page_widget.vision_widget.update_live_display(frame)
         if hasattr(self, "processing_worker") and self.processing_worker:
             proc_frame = self.processing_worker.get_latest_proc_frame()
-            if proc_frame is not None:
+            if self._is_new_frame("proc", proc_frame):
                 self.vision_page_widget.roi_vision_widget.update_live_display(proc_frame)
                 self.home_widget.dieswell_widget.update_live_display(proc_frame)
         if self.ir_worker:
             ir_frame = self.ir_worker.get_latest_frame()
-            if ir_frame is not None:
+            if self._is_new_frame("ir", ir_frame):
                 self.ir_page_widget.image_widget.update_live_display(ir_frame)
             ir_roi = self.ir_worker.get_latest_roi_frame()
-            if ir_roi is not None:
+            if self._is_new_frame("ir_roi", ir_roi):
                 self.home_widget.ir_roi_widget.update_live_display(ir_roi)
 
+    def _is_new_frame(self, source: str, frame) -> bool:
+        """True if `frame` is not None and is not the array last displayed for `source`. Workers publish a new array object per captured frame, so an identity check is enough."""
+        if frame is None or self._last_display_frames.get(source) is frame:
+            return False
+        self._last_display_frames[source] = frame
+        return True
+
     @Slot()
     def initiate_camera(self):
         """Try to initiate the Hikrobot camera. 
@@ -472,7 +527,7 @@ class MainWindow(QMainWindow):
             self.vision_page_widget.vision_widget.sigRoiChanged.connect(self.video_worker.set_roi)
             
             # update frame size 
-            self.vision_page_widget.vision_widget.sigRoiChanged.connect(self.update_frame_size)
+            self.vision_page_widget.vision_widget.sigRoiChanged.connect(self.update_frame_size, Qt.ConnectionType.UniqueConnection)
 
             # allow user to set the exposure time of the camera
             self.vision_page_widget.sigExpTime.connect(self.video_worker.set_exp_time)
@@ -485,8 +540,9 @@ class MainWindow(QMainWindow):
             self.video_thread.finished.connect(self.video_thread.deleteLater)
 
             self.video_thread.start()
-            self._display_timer = QTimer(self)
-            self._display_timer.timeout.connect(self._refresh_displays)
+            if getattr(self, "_display_timer", None) is None: # reuse the timer on reconnect
+                self._display_timer = QTimer(self)
+                self._display_timer.timeout.connect(self._refresh_displays)
             self._display_timer.start(int(1000 / self.video_worker.fps))
             self._register_sensor_items(["die_diameter_px"])
             self.tabs.setTabVisible(self.tabs.indexOf(self.vision_page_widget), True)
@@ -501,6 +557,7 @@ class MainWindow(QMainWindow):
         # 创建 image processing worker 用于处理图像，探测熔体直径
         self.processing_worker = ProcessingWorker()
         self.processing_worker.setObjectName("ProcessingWorker")
+        self._build_status_plan()
 
         if self.video_worker:
 
@@ -518,42 +575,46 @@ class MainWindow(QMainWindow):
     @Slot()
     def initiate_ir_imager(self):
         """Try to initiate the IR image. If failed, the status flag should be marked False. Ideally, the software should attempt reconnection a few times if connection is lost. This should be handled in the IR imager class."""
-        try: # 创建 IR image worker 处理红外成像仪图像，探测熔体出口温度   
-            self.ir_worker = IRWorker()
-            self.ir_thread = QThread()
-            self.ir_thread.setObjectName("IRThread")
-            self.ir_worker.moveToThread(self.ir_thread)
-
-            # if user draw an ROI on the canvas, send the ROI info to the IR worker, so that in the future, the worker can crop the later frames
-            self.ir_page_widget.image_widget.sigRoiChanged.connect(self.ir_worker.set_roi)
-
-            # use a thread to handle the image reading and showing loop
-            self.ir_thread.started.connect(self.ir_worker.run)
-            self.ir_thread.finished.connect(self.ir_thread.deleteLater)
-            self.ir_worker.sigFinished.connect(self.ir_worker.deleteLater)
-
-            # the Optris Xi 400 camera comes with 6 different temperature ranges (-20~100, 0~250, 150~900). Smaller ranges, intuitively, have better precision, while larger ranges do not. Here, we read out all the available temperature range options and put them in a drop down menu for users to select.
-            for item in self.ir_worker.ranges:
-                self.ir_page_widget.mode_menu.addItem(f"{item["min_temp"]} - {item["max_temp"]}")
+        self.ir_worker = None
+        if self.test_mode:
+            self.logger.info(f"由于测试模式开启，热成像仪模块被跳过")
+        elif not OPTRIS_LIB_LOADED:
+            self.logger.warning("Optris SDK 未加载，热成像仪不可用")
+        else:
+            try: # 创建 IR image worker 处理红外成像仪图像，探测熔体出口温度
+                self.ir_worker = IRWorker()
+                self.ir_thread = QThread()
+                self.ir_thread.setObjectName("IRThread")
+                self.ir_worker.moveToThread(self.ir_thread)
+
+                # if user draw an ROI on the canvas, send the ROI info to the IR worker, so that in the future, the worker can crop the later frames
+                self.ir_page_widget.image_widget.sigRoiChanged.connect(self.ir_worker.set_roi)
+
+                # use a thread to handle the image reading and showing loop
+                self.ir_thread.started.connect(self.ir_worker.run)
+                self.ir_thread.finished.connect(self.ir_thread.deleteLater)
+                self.ir_worker.sigFinished.connect(self.ir_worker.deleteLater)
+
+                # the Optris Xi 400 camera comes with 6 different temperature ranges (-20~100, 0~250, 150~900). Smaller ranges, intuitively, have better precision, while larger ranges do not. Here, we read out all the available temperature range options and put them in a drop down menu for users to select.
+                for item in self.ir_worker.ranges:
+                    self.ir_page_widget.mode_menu.addItem(f"{item["min_temp"]} - {item["max_temp"]}")
             
-            # if a temperature range is chosen, set it to the IR worker, so that it can re-initiate a camera object with updated params. 
-            self.ir_page_widget.mode_menu.currentIndexChanged.connect(self.ir_worker.set_range)
+                # if a temperature range is chosen, set it to the IR worker, so that it can re-initiate a camera object with updated params. 
+                self.ir_page_widget.mode_menu.currentIndexChanged.connect(self.ir_worker.set_range)
 
-            # a scrollbar that allows focus adjustment.
-            self.ir_page_widget.focus_bar.valueChanged.connect(self.ir_worker.set_position)
+                # a scrollbar that allows focus adjustment.
+                self.ir_page_widget.focus_bar.valueChanged.connect(self.ir_worker.set_position)
 
-            self.ir_thread.start()
-            self._register_sensor_items(["die_temperature_C"])
-            self.tabs.setTabVisible(self.tabs.indexOf(self.ir_page_widget), True)
+                self.ir_thread.start()
+                self._register_sensor_items(["die_temperature_C"])
+                self.tabs.setTabVisible(self.tabs.indexOf(self.ir_page_widget), True)
 
-        except Exception as e:
-            if self.test_mode:
-                self.logger.info(f"由于测试模式开启，热成像仪模块被跳过")
-            else:
+            except Exception as e: # SDK / device errors vary by driver version, keep the app usable without the imager
                 self.logger.warning(f"初始化热成像仪失败，热成像仪不可用: {e}")
-            self.ir_worker = None
+                self.ir_worker = None
 
         self.status_widget.set_die_temperature_visible(self.ir_worker is not None)
+        self._build_status_plan()
             
         if not hasattr(self, "_display_timer") or self._display_timer is None:
             self._display_timer = QTimer(self)
@@ -569,16 +630,17 @@ class MainWindow(QMainWindow):
     def on_toggle_play_pause(self, checked):
         if checked: 
             self.home_widget.play_pause_button.setIcon(self.home_widget.pause_icon)
-            self.autosave_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.autosave_filename = Path(f"~/Desktop/{self.autosave_prefix}_autosave.csv").expanduser()
-            
+            self.autosave_prefix = time.strftime("%Y%m%d_%H%M%S")
+            autosave_stem = Path(f"~/Desktop/{self.autosave_prefix}_autosave").expanduser()
+
             self.logger.info("开始记录数据 ...")
+            with self._autosave_lock:
+                self._autosave_columns = list(self.data_status.keys())
+                self._autosave_writer = open_autosave_writer(
+                    autosave_stem, self._autosave_columns, self.autosave_format, self.tmp_data_maxlen
+                )
+            self.autosave_filename = self._autosave_writer.path
             self.statusBar().showMessage(f"文件路径：{self.autosave_filename}")
-            with self._csv_lock:
-                self._csv_columns = list(self.data_status.keys())
-                self._csv_file = open(self.autosave_filename, "w", newline="", encoding="utf-8")
-                self._csv_writer = csv.writer(self._csv_file)
-                self._csv_writer.writerow(self._csv_columns)
             self.is_recording = True
             if self.record_timelapse and self.video_worker:
                 # init video recorder
@@ -595,11 +657,10 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("记录已停止")
             self.autosave_filename = None
             self.is_recording = False
-            with self._csv_lock:
-                if self._csv_file:
-                    self._csv_file.close()
-                    self._csv_file = None
-                    self._csv_writer = None
+            with self._autosave_lock:
+                if self._autosave_writer:
+                    self._autosave_writer.close()
+                    self._autosave_writer = None
             if self.record_timelapse and self.video_worker:
                 self.processing_worker.proc_frame_signal.disconnect(self.video_recorder_thread.add_frame)
                 self.video_recorder_thread.close()
@@ -615,51 +676,43 @@ class MainWindow(QMainWindow):
     
     def _collect_data(self):
         """Called from _DataCollectorThread at the configured data_frequency."""
-        self.grab_status()
-        for item in self.data:
-            self.data[item].append(self.data_status[item])
+        self.data.append(self.grab_status())
 
         if self.is_recording:
-            with self._csv_lock:
-                if self._csv_writer is not None:
-                    self._csv_writer.writerow([self.data_status[col] for col in self._csv_columns])
+            with self._autosave_lock:
+                if self._autosave_writer is not None:
+                    self._autosave_writer.write_row([self.data_status[col] for col in self._autosave_columns])
 
     @Slot()
     def _emit_display_data(self):
-        self.sigNewData.emit(self.data)
+        """Send only the rows appended since the last emit; the receivers keep their own windows."""
+        columns, rows, self._display_cursor = self.data.rows_since(self._display_cursor)
+        if len(rows):
+            self.sigNewData.emit(columns, rows)
 
     def on_status_timer_tick(self):
         """Update the status panel."""
         self.sigNewStatus.emit(self.data_status)
-        self.sigProgress.emit(self.klipper_worker.progress)
-        self.sigFilePosition.emit(self.klipper_worker.file_position)
+        progress = self.klipper_worker.progress
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self.sigProgress.emit(progress)
+        file_position = self.klipper_worker.file_position
+        if file_position != self._last_file_position:
+            self._last_file_position = file_position
+            self.sigFilePosition.emit(file_position)
+
+    @Slot(str)
+    def _on_gcode_file_changed(self, _path):
+        """A new file needs its line highlighted even if Klipper reports the same position."""
+        self._last_file_position = None
 
     def grab_status(self):
-        latest_sensor = dict(self.worker.latest_sensor_data) if self.worker else {}
-        if "die_temperature_C" in self.sensor_data_items and self.ir_worker:
-            latest_sensor["die_temperature_C"] = self.ir_worker.die_temperature
-        if "die_diameter_px" in self.sensor_data_items and self.processing_worker:
-            latest_sensor["die_diameter_px"] = self.processing_worker.die_diameter
-
-        for item in self.data_status:
-            # NOTE: here we append new data to both data_tmp and data. The idea is to grow both data together, so that in the preview panel we can use data to see the temporal evolution of the numbers at any time, mean time having a good file writing frequency (using the cached data_tmp) file, so that I/O is not a bottleneck.
-            if item in self.sensor_data_items:
-                self.data_status[item] = latest_sensor.get(item, np.nan)
-            elif item == "measured_temperature_C":
-                self.data_status[item] = self.klipper_worker.hotend_temperature
-            elif item == "temperature_C":
-                self.data_status[item] = self.klipper_worker.target_hotend_temperature
-            elif item == "feedrate_mms":
-                self.data_status[item] = self.klipper_worker.active_feedrate_mms
-            elif item == "measured_feedrate_mms":
-                self.data_status[item] = latest_sensor.get("measured_feedrate_mms", np.nan)
-            elif item == "time_s":
-                self.data_status[item] = time.monotonic() - self._session_start
-            elif item == "gcode":
-                if self.klipper_worker:
-                    self.data_status[item] = self.klipper_worker.active_gcode
-            else:
-                self.data_status[item] = np.nan
+        """Sample every data column once. Refreshes `self.data_status` and returns the values as a row in column order."""
+        self._sensors = self.worker.latest_sensor_data if self.worker else {}
+        status = {item: getter(self) for item, getter in self._status_plan}
+        self.data_status = status
+        return list(status.values())
 
     @asyncSlot(str)
     async def update_host_and_connect(self, host):
@@ -707,9 +760,10 @@ class MainWindow(QMainWindow):
                 self.ir_thread.wait(500)
         if hasattr(self, "processing_worker") and self.processing_worker:
             self.processing_worker.stop()
-        if self._csv_file:
-            self._csv_file.close()
-            self._csv_file = None
+        with self._autosave_lock:
+            if self._autosave_writer:
+                self._autosave_writer.close()
+                self._autosave_writer = None
         self.logger.info("正在关闭应用程序...")
         event.accept()
 
@@ -43,10 +43,10 @@ def find_app_file(filename: str, package_file: Path, compiled: bool = False) ->
 
 
 def load_config(config_file: Path) -> dict:
-    import json
+    from .json_backend import loads
 
-    with open(config_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(config_file, "rb") as f:
+        return loads(f.read())
 
 
 def build_main_window_stylesheet(
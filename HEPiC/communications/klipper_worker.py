@@ -1,14 +1,41 @@
 from qasync import asyncSlot
 from PySide6.QtCore import QObject, Signal, Slot
 import asyncio
+import contextlib
 import websockets
 import logging
 import json
 import random
 import sys
-import numpy as np
+from math import nan
 import os
-import requests
+import aiohttp
+try:
+    from ..json_backend import loads, dumps
+except ImportError:
+    # run as a script (python klipper_worker.py): no parent package, use the stdlib parser
+    from json import loads
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+_EMPTY = {} # shared read-only default for missing status objects
+_OUTBOX_MAXLEN = 256 # pending outbound requests; beyond this the connection is stalled and new requests are dropped
+
+
+def _is_ignored_notification(message) -> bool:
+    """Cheap pre-parse check for Moonraker notifications that `_process_message` only logs.
+
+    Moonraker pushes `notify_proc_stat_update` every second plus other `notify_*`
+    events; only `notify_gcode_response` is acted on. The method name sits in the
+    first few dozen characters of a notification, so a substring test on that head
+    avoids a full JSON parse of the frame.
+    """
+    head = message[:64]
+    if isinstance(head, bytes):
+        head = head.decode("utf-8", errors="ignore")
+    return "notify_" in head and "notify_gcode_response" not in head
+
 
 class KlipperWorker(QObject):
     """
@@ -41,22 +68,32 @@ class KlipperWorker(QObject):
         self._reconnect_attempts = 0
 
         # status / data
-        self.is_running = True
+        self._stop_evt = asyncio.Event() # set by stop(); wakes run() out of any wait immediately
         self._init_data()
         
-        # message queue
+        # inbound message queue (parsed frames from Moonraker); outbound requests are appended to _outbox by _send()
+        # and written by message_writer()
         self.message_queue = asyncio.Queue()
+        self._websocket = None
+        self._outbox = [] # (encoded request, batchable) waiting for message_writer
+        self._outbox_ready = asyncio.Event()
+        self._urgent_sends = set() # in-flight emergency_stop sends, kept referenced until done
         
         # task handlers
         self.listener_task = None
         self.processor_task = None
+        self.writer_task = None
         self.query_task = None
 
+    @property
+    def is_running(self) -> bool:
+        return not self._stop_evt.is_set()
+
     def _init_data(self):
         # initiate internal data container
         self.active_feedrate_mms = 0
-        self.hotend_temperature = np.nan
-        self.target_hotend_temperature = np.nan
+        self.hotend_temperature = nan
+        self.target_hotend_temperature = nan
         self.progress = 0.0
         self.file_position = 0
         self.active_gcode = ""
@@ -93,37 +130,44 @@ class KlipperWorker(QObject):
         if self.test_mode:
             self.logger.info("测试模式：跳过 Klipper WebSocket 连接。")
             self.connection_status.emit("🧪 测试模式：Klipper 连接已跳过。")
-            while self.is_running:
-                await asyncio.sleep(1)
+            await self._stop_evt.wait()
             return
 
-        while self.is_running:
+        while not self._stop_evt.is_set():
             try:
                 self.logger.info(f"正在连接 Klipper {self.uri} ...")
                 self.connection_status.emit(f"正在连接 Klipper {self.uri} ...")
-                async with websockets.connect(self.uri, open_timeout=2.0) as websocket:
+                # small JSON frames on a LAN: permessage-deflate costs more CPU than it saves
+                async with websockets.connect(self.uri, open_timeout=2.0, compression=None) as websocket:
                     self.logger.info("Klipper 连接成功！")
                     self.connection_status.emit("Klipper 连接成功！")
                     self._reset_reconnect_backoff()
+                    self._websocket = websocket
 
-                    # clear message queue if it's not empty
-                    while not self.message_queue.empty():
-                        try: self.message_queue.get_nowait()
-                        except: pass
+                    # drop messages left over from the previous connection: a fresh queue is O(1),
+                    # and it is bound before the listener/processor tasks below start using it
+                    self.message_queue = asyncio.Queue()
+                    self._outbox = []
+                    self._outbox_ready.clear()
 
                     self.listener_task = asyncio.create_task(self.message_listener(websocket))
-                    self.processor_task = asyncio.create_task(self.data_processor(websocket))
+                    self.processor_task = asyncio.create_task(self.data_processor())
+                    self.writer_task = asyncio.create_task(self.message_writer(websocket))
                     self.query_task = asyncio.create_task(self.query_klipper())
+                    stop_task = asyncio.create_task(self._stop_evt.wait())
 
                     done, pending = await asyncio.wait(
-                        [self.listener_task, self.processor_task],
+                        [self.listener_task, self.processor_task, self.writer_task, stop_task],
                         return_when=asyncio.FIRST_COMPLETED
                     )
 
-                    self.logger.warning("连接已中断，正在清理任务...")
+                    if stop_task in done:
+                        self.logger.info("收到停止信号，正在关闭 Klipper 连接...")
+                    else:
+                        self.logger.warning("连接已中断，正在清理任务...")
                     # 读取已完成任务的异常，避免 "Task exception was never retrieved" 噪音。
                     # ConnectionClosed 等断开异常是预期的（触发重连）。
-                    for task in done:
+                    for task in done - {stop_task}:
                         exc = task.exception()
                         if exc is not None:
                             self.logger.info(f"任务结束于异常（将重连）: {exc!r}")
@@ -144,44 +188,54 @@ class KlipperWorker(QObject):
                 self.logger.error(f"Klipper 连接异常: {e}")
                 self.connection_status.emit(f"Klipper 连接异常，等待重连...")
             finally:
+                self._websocket = None
                 # 始终取消 query_task，避免任务泄漏（包括 stop() 退出时）
                 await self._cancel_task(self.query_task)
                 self.query_task = None
 
-            # 如果 is_running 依然为 True，说明是意外断开，需要重连
-            if self.is_running:
+            # 如果尚未收到停止信号，说明是意外断开，需要重连
+            if not self._stop_evt.is_set():
                 delay = self._next_reconnect_delay()
                 self.connection_status.emit(f"连接断开，{delay:.0f}秒后重连...")
                 self.logger.info(f"将在 {delay:.0f} 秒后尝试重连...")
-                # 分段 sleep，使 stop()/is_running 能被及时响应
-                remaining = delay
-                while remaining > 0 and self.is_running:
-                    step = min(1.0, remaining)
-                    await asyncio.sleep(step)
-                    remaining -= step
+                # 等待 delay 秒，期间 stop() 会立即唤醒
+                try:
+                    await asyncio.wait_for(self._stop_evt.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
             
     async def message_listener(self, websocket):
         self.logger.info("消息监听器已启动")
         try:
-            async for message in websocket:
+            while True:
+                # decode=False: hand the raw UTF-8 bytes to the JSON parser instead of building a str first
+                message = await websocket.recv(decode=False)
+                if _is_ignored_notification(message) and not self.logger.isEnabledFor(logging.DEBUG):
+                    continue
                 try:
-                    data = json.loads(message)
-                    await self.message_queue.put(data)
+                    data = loads(message)
+                    if isinstance(data, list): # response to a batched request
+                        for item in data:
+                            await self.message_queue.put(item)
+                    else:
+                        await self.message_queue.put(data)
                 except json.JSONDecodeError as e:
                     self.logger.error(f"JSON 解析失败: {e}. 消息体: {message}")
                 except Exception as e:
                     self.logger.error(f"放入队列时出错: {e}")
 
+        except websockets.exceptions.ConnectionClosedOK:
+            self.logger.info("监听器: WebSocket 连接已正常关闭")
         except websockets.exceptions.ConnectionClosed as e:
-            self.logger.error(f"监听器: WebSocket 连接已关闭 (代码: {e.code}, 原因: {e.reason})")
+            self.logger.error(f"监听器: WebSocket 连接已关闭 ({e})")
         except Exception as e:
             # 捕获其他所有未知错误
             self.logger.error(f"消息监听器崩溃: {e}")
         finally:
             self.logger.debug("消息监听器已退出")
 
-    @asyncSlot(str)
-    async def send_gcode(self, gcode):
+    @Slot(str)
+    def send_gcode(self, gcode):
         """接收来自主线程的 gcode，并发给 Klipper。本程序会将整个 gcode 文本一次性发送给 Klipper.
         
         Parameters
@@ -200,62 +254,115 @@ class KlipperWorker(QObject):
             },
         }
 
-        await self.message_queue.put(gcode_message)
-        self.logger.debug(f"put gcode message into queue: {self.gcode[:30]} ..")
-       
-    async def data_processor(self, websocket):
+        self._send(gcode_message)
+        self.logger.debug("sent gcode message: %.30s ..", self.gcode)
+
+    def _send(self, payload, batchable=False):
+        """
+        将 JSON-RPC 请求编码后放入 `_outbox`，由 message_writer 写入 WebSocket；未连接或积压过多时丢弃并记录警告。
+
+        本方法是同步的，调用方（Qt 槽函数等）无需为每条请求创建协程或任务。
+
+        Parameters
+        ----------
+        payload : dict | str
+            JSON-RPC request, or an already encoded request (for fixed requests sent repeatedly, e.g. the status query).
+        batchable : bool
+            True only for requests Moonraker answers at once (status query / subscribe). Moonraker runs the items of a
+            batch one after another and replies when all are done, so a slow `printer.gcode.script` must never share an
+            array with other requests.
+        """
+        frame = payload if isinstance(payload, str) else dumps(payload).decode()
+        if self._websocket is None:
+            self.logger.warning(f"Klipper 未连接，消息未发送: {frame[:80]}")
+            return
+        if len(self._outbox) >= _OUTBOX_MAXLEN:
+            self.logger.warning(f"发送积压过多，消息未发送: {frame[:80]}")
+            return
+        self._outbox.append((frame, batchable))
+        self._outbox_ready.set()
+
+    def _send_now(self, payload):
+        """
+        绕过 `_outbox` 立即以单独一帧发送请求（急停用）：不受积压上限限制，也不会排在正在发送或已合并的请求之后。
+        """
+        frame = dumps(payload).decode()
+        websocket = self._websocket
+        if websocket is None:
+            self.logger.warning(f"Klipper 未连接，消息未发送: {frame[:80]}")
+            return
+        task = asyncio.ensure_future(websocket.send(frame))
+        self._urgent_sends.add(task)
+        task.add_done_callback(self._on_urgent_send_done)
+
+    def _on_urgent_send_done(self, task):
+        self._urgent_sends.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"急停指令发送失败: {task.exception()}")
+
+    async def message_writer(self, websocket):
+        """
+        WebSocket 唯一的写端：等待 `_outbox` 中有请求后写入 WebSocket。
+
+        写的过程中到达的请求留在 `_outbox` 中，本次发送结束后按原顺序发出：相邻的可合并请求（状态查询 / 订阅）合并为一个
+        JSON-RPC batch（数组），Moonraker 会以数组形式返回各自的响应；其余请求（gcode 等）各自单独一帧，不会让别的请求
+        等它执行完。连接断开时 ConnectionClosed 向上抛出，由 run() 触发重连。
+        """
+        while True:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            pending, self._outbox = self._outbox, []
+            batch = []
+            for frame, batchable in pending:
+                if batchable:
+                    batch.append(frame)
+                    continue
+                if batch:
+                    await websocket.send(self._join_batch(batch))
+                    batch = []
+                await websocket.send(frame) # text frame, as Moonraker clients send
+            if batch:
+                await websocket.send(self._join_batch(batch))
+
+    @staticmethod
+    def _join_batch(frames):
+        return frames[0] if len(frames) == 1 else "[" + ",".join(frames) + "]"
+
+    async def data_processor(self):
         """
-        消费者：从队列中等待并获取数据，然后进行处理。本函数需要处理多种与 Klipper 的通讯信息，至少包含 i) 订阅回执，ii) gcode 发送。
+        消费者：从队列中等待并获取 Klipper 发来的消息，然后进行处理（订阅回执、查询结果、gcode 响应、错误）。出站请求不经过本队列，由 _send() 放入 _outbox、message_writer 发送。
         """
         self.logger.info("数据处理器已启动，等待数据...")
+        queue = self.message_queue
         while True:
-            # 核心：在这里await，等待队列中有新数据
-            data = await self.message_queue.get()
-
-            # 单条畸形/意外结构的消息不应拖垮整个连接：逐条隔离处理。
-            # 连接级错误 (ConnectionClosed) 仍向上抛出，由 run() 触发重连。
-            try:
-                self._process_message(data)
-                if isinstance(data, dict) and "method" in data and data.get("method") in (
-                    "printer.gcode.script",
-                    "printer.objects.subscribe",
-                    "printer.objects.query",
-                    "printer.emergency_stop",
-                    "printer.restart",
-                    "printer.firmware_restart",
-                ):
-                    await websocket.send(json.dumps(data))
-            except websockets.exceptions.ConnectionClosed:
-                raise  # 让 run() 重连
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                self.logger.error(f"处理消息时出错，已跳过该消息: {e}. 消息体: {data}")
-            finally:
-                # 标记任务完成，这对于优雅退出很重要
-                self.message_queue.task_done()
+            # 核心：在这里await，等待队列中有新数据；醒来后一次处理完队列中已有的全部消息（如 batch 响应），不再逐条 await
+            data = await queue.get()
+            while True:
+                # 单条畸形/意外结构的消息不应拖垮整个连接：逐条隔离处理。
+                try:
+                    self._process_message(data)
+                except Exception as e:
+                    self.logger.error(f"处理消息时出错，已跳过该消息: {e}. 消息体: {data}")
+                finally:
+                    # 标记任务完成，这对于优雅退出很重要
+                    queue.task_done()
+                try:
+                    data = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
 
     def _process_message(self, data):
-        """解析并分发单条来自 Klipper 的消息（不含网络发送，发送由 data_processor 处理）。"""
+        """解析并分发单条来自 Klipper 的消息（不含网络发送，发送由 _send 处理）。"""
         if not isinstance(data, dict):
-            self.logger.debug(f"忽略非字典消息: {data!r}")
+            # 逐条消息路径上的 debug 日志使用 %-惰性格式化，未开启 DEBUG 时不会构造消息字符串
+            self.logger.debug("忽略非字典消息: %r", data)
             return
 
         if "method" in data:
-            if data["method"] in [
-                "printer.gcode.script",
-                "printer.objects.subscribe",
-                "printer.objects.query",
-                "printer.emergency_stop",
-                "printer.restart",
-                "printer.firmware_restart",
-            ]:
-                # 这是我们要发往 Klipper 的出站消息；实际发送在 data_processor 中完成。
-                return
-            elif data["method"] == "notify_gcode_response":
+            if data["method"] == "notify_gcode_response":
                 params = data.get("params") or []
                 if not params:
-                    self.logger.debug(f"notify_gcode_response 无 params，已忽略: {data}")
+                    self.logger.debug("notify_gcode_response 无 params，已忽略: %s", data)
                     return
                 response = params[0]
                 _state_map = {
@@ -275,16 +382,18 @@ class KlipperWorker(QObject):
         elif "result" in data:
             self.logger.debug(data)
             if data.get("id") == 2:
-                sub_msg = data.get("result", {}).get("status", {})
-                self.hotend_temperature = sub_msg.get("extruder", {}).get("temperature", np.nan)
-                self.target_hotend_temperature = sub_msg.get("extruder", {}).get("target", np.nan)
-                self.active_feedrate_mms = sub_msg.get("motion_report", {}).get("live_extruder_velocity", 0.0)
-                self.progress = sub_msg.get("virtual_sdcard", {}).get("progress", 0.0)
-                self.file_position = sub_msg.get("virtual_sdcard", {}).get("file_position", 0.0)
-                self.print_state = sub_msg.get("print_stats", {}).get("state", self.print_state)
+                status = data["result"].get("status") or _EMPTY
+                extruder = status.get("extruder") or _EMPTY
+                self.hotend_temperature = extruder.get("temperature", nan)
+                self.target_hotend_temperature = extruder.get("target", nan)
+                self.active_feedrate_mms = (status.get("motion_report") or _EMPTY).get("live_extruder_velocity", 0.0)
+                sdcard = status.get("virtual_sdcard") or _EMPTY
+                self.progress = sdcard.get("progress", 0.0)
+                self.file_position = sdcard.get("file_position", 0.0)
+                self.print_state = (status.get("print_stats") or _EMPTY).get("state", self.print_state)
                 if self.print_state == "complete":
                     self.progress = 1.0
-                webhooks = sub_msg.get("webhooks", {})
+                webhooks = status.get("webhooks") or _EMPTY
                 state = webhooks.get("state", "")
                 message = webhooks.get("state_message", "")
                 if state:
@@ -310,17 +419,11 @@ class KlipperWorker(QObject):
 
     @Slot()
     def stop(self):
-        """停止线程"""
-        self.is_running = False
-        if self.listener_task:
-            self.listener_task.cancel()
-        if self.processor_task:
-            self.processor_task.cancel()
-        if self.query_task:
-            self.query_task.cancel()
-
-    @asyncSlot(float)
-    async def set_temperature(self, target):
+        """停止线程：run() 等待着停止事件，会立即取消各任务并退出，无需轮询"""
+        self._stop_evt.set()
+
+    @Slot(float)
+    def set_temperature(self, target):
         gcode_message = {
             "jsonrpc": "2.0",
             "id": 104, 
@@ -329,10 +432,10 @@ class KlipperWorker(QObject):
                 "script": f"M104 S{target}",
             },
         }
-        await self.message_queue.put(gcode_message)
-        self.logger.debug("set temperature to: {target} C")
+        self._send(gcode_message)
+        self.logger.debug("set temperature to: %s C", target)
 
-    async def subscribe_printer_status(self):
+    def subscribe_printer_status(self):
         subscribe_message = {
             "jsonrpc": "2.0",
             "method": "printer.objects.subscribe",
@@ -348,7 +451,7 @@ class KlipperWorker(QObject):
             "id": 1
         }
         
-        await self.message_queue.put(subscribe_message)
+        self._send(subscribe_message, batchable=True)
     
     async def query_klipper(self):
         query_msg = {
@@ -365,15 +468,16 @@ class KlipperWorker(QObject):
             },
             "id": 2
         }
+        query_frame = dumps(query_msg).decode() # the request never changes, encode it once
         while True:
-            await self.message_queue.put(query_msg)
+            self._send(query_frame, batchable=True)
             await asyncio.sleep(self.query_delay)
 
-    def upload_gcode_to_klipper(self, file_path, print_after_upload=True):
+    @asyncSlot(str)
+    async def upload_gcode_to_klipper(self, file_path, print_after_upload=True):
         """
-        上传 G-code 文件到 Klipper (Moonraker)。
+        上传 G-code 文件到 Klipper (Moonraker)。文件以分块方式流式上传，不会整体读入内存，也不会阻塞事件循环。
         
-        :param ip_address: 上位机 (树莓派) 的 IP 地址
         :param file_path: 本地 G-code 文件的路径
         :param print_after_upload: 是否上传后立即开始打印 (True/False)
         """
@@ -389,38 +493,39 @@ class KlipperWorker(QObject):
         # 获取文件名
         filename = os.path.basename(file_path)
 
-        # 准备 Payload
-        # 'root': 通常是 'gcodes'，表示上传到 G-code 文件夹
-        data = {
-            'root': 'gcodes',
-            'print': 'true' if print_after_upload else 'false'
-        }
-
         try:
             with open(file_path, 'rb') as f:
                 # 构建 multipart/form-data
-                files = {'file': (filename, f)}
-                
+                # 'root': 通常是 'gcodes'，表示上传到 G-code 文件夹
+                form = aiohttp.FormData()
+                form.add_field('root', 'gcodes')
+                form.add_field('print', 'true' if print_after_upload else 'false')
+                form.add_field('file', f, filename=filename, content_type='application/octet-stream')
+
                 self.logger.info(f"正在上传 {filename} 到 {self.host}...")
-                response = requests.post(url, data=data, files=files)
-                
-                # 检查响应
-                if response.status_code in [200, 201]:
-                    self.logger.info("上传成功！")
-                    self.logger.info("服务器响应:", response.json())
-                else:
-                    self.logger.info(f"上传失败，状态码: {response.status_code}")
-                    self.logger.info("错误信息:", response.text)
+                # 大文件上传可能较慢，只限制建立连接的时间
+                timeout = aiohttp.ClientTimeout(total=None, sock_connect=5)
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with session.post(url, data=form) as response:
+                        # 检查响应
+                        if response.status in [200, 201]:
+                            self.logger.info("上传成功！")
+                            self.logger.info(f"服务器响应: {await response.text()}")
+                        else:
+                            self.logger.info(f"上传失败，状态码: {response.status}")
+                            self.logger.info(f"错误信息: {await response.text()}")
                     
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"连接错误: {e}")
         
         finally:
-            # delete the temporary gcode file
-            os.remove(file_path)
+            # delete the temporary gcode file; a failure here (e.g. the file is still open
+            # elsewhere on Windows) must not escape the asyncSlot
+            with contextlib.suppress(OSError):
+                os.remove(file_path)
 
-    @asyncSlot()
-    async def restart_firmware(self):
+    @Slot()
+    def restart_firmware(self):
         self.logger.info("Restarting firmware ...")
         self.gcode_response.emit("// 正在发送固件重启指令，等待 Klipper 就绪...")
         self._prev_klipper_state = ""
@@ -429,10 +534,10 @@ class KlipperWorker(QObject):
             "method": "printer.firmware_restart",
             "id": 7,
         }
-        await self.message_queue.put(payload)
+        self._send(payload)
 
-    @asyncSlot()
-    async def printer_restart(self):
+    @Slot()
+    def printer_restart(self):
         self.logger.info("Restarting Klipper ...")
         self.gcode_response.emit("// 正在发送 Klipper 重启指令，等待就绪...")
         self._prev_klipper_state = ""
@@ -441,10 +546,10 @@ class KlipperWorker(QObject):
             "method": "printer.restart",
             "id": 6,
         }
-        await self.message_queue.put(payload)
+        self._send(payload)
 
-    @asyncSlot()
-    async def emergency_stop(self):
+    @Slot()
+    def emergency_stop(self):
         """
         发送最高优先级的急停指令
         """
@@ -454,9 +559,9 @@ class KlipperWorker(QObject):
             "id": 0
         }
         self.logger.warning("!!! SENDING EMERGENCY STOP !!!")
-        await self.message_queue.put(payload)
+        self._send_now(payload)
 
-    @Slot()
+    @Slot(str)
     def set_active_gcode(self, gcode):
         self.active_gcode = gcode
     
@@ -471,6 +576,9 @@ class MockMoonrakerServer:
         self.server = None
         # 存储每个连接的订阅状态
         self.client_subscriptions = {}
+        # printer_state 每次改变时递增；状态通知按 (订阅集合) 缓存编码结果，状态未变时直接复用
+        self._state_version = 0
+        self._notify_cache = {} # frozenset(订阅对象) -> (state_version, 编码后的通知)
         
         # 我们的“虚拟Klipper打印机”的完整状态
         self.printer_state = {
@@ -547,14 +655,19 @@ class MockMoonrakerServer:
             self.logger.info(f"客户端 {client_id} 清理完毕。")
 
     async def process_message(self, websocket, message):
-        """解析并分发 JSON-RPC 消息"""
+        """解析并分发 JSON-RPC 消息（单条或 batch 数组）"""
         try:
-            data = json.loads(message)
-            self.logger.debug(f"收到 C->S: {data}")
+            data = loads(message)
+            self.logger.debug("收到 C->S: %s", data)
         except json.JSONDecodeError:
             self.logger.error(f"收到无效的JSON: {message}")
             return
 
+        for request in data if isinstance(data, list) else [data]:
+            await self.process_request(websocket, request)
+
+    async def process_request(self, websocket, data):
+        """处理单条 JSON-RPC 请求"""
         # 获取请求 ID，通知消息没有 ID
         request_id = data.get("id")
         method = data.get("method")
@@ -613,6 +726,7 @@ class MockMoonrakerServer:
             elif script.startswith("M140"): # 设置热床温度
                 temp = float(script.split("S")[1])
                 self.printer_state["heater_bed"]["target"] = temp
+            self._state_version += 1
             
             # 1. 发送 G-code 响应
             gcode_response = {
@@ -668,14 +782,17 @@ class MockMoonrakerServer:
         if not subscribed_objects:
             return # 客户端什么都没订阅
 
-        status_update = self.get_objects_state(subscribed_objects)
-        
-        notification = {
-            "jsonrpc": "2.0",
-            "method": "notify_status_update",
-            "params": [status_update]
-        }
-        await self.send(websocket, notification)
+        key = frozenset(subscribed_objects)
+        cached = self._notify_cache.get(key)
+        if cached is None or cached[0] != self._state_version:
+            notification = {
+                "jsonrpc": "2.0",
+                "method": "notify_status_update",
+                "params": [self.get_objects_state(subscribed_objects)]
+            }
+            cached = (self._state_version, dumps(notification).decode())
+            self._notify_cache[key] = cached
+        await self.send(websocket, cached[1])
 
     def get_objects_state(self, object_keys):
         """从主状态中提取特定对象"""
@@ -700,8 +817,10 @@ class MockMoonrakerServer:
                     current = self.printer_state[key]["temperature"]
                     if target > current:
                         self.printer_state[key]["temperature"] = min(current + 1.5, target)
+                        self._state_version += 1
                     elif target < current:
                         self.printer_state[key]["temperature"] = max(current - 1.5, target)
+                        self._state_version += 1
                 
                 # 2. 模拟打印机移动 (如果归位了)
                 if "xyz" in self.printer_state["toolhead"]["homed_axes"]:
@@ -711,6 +830,7 @@ class MockMoonrakerServer:
                     self.printer_state["toolhead"]["position"][1] = max(0, min(new_y, 250))
                     # 确保 gcode_position 也更新
                     self.printer_state["gcode_move"]["gcode_position"] = self.printer_state["toolhead"]["position"]
+                    self._state_version += 1
 
                 # 3. 向客户端发送更新
                 await self.notify_status_update(websocket)
@@ -721,9 +841,9 @@ class MockMoonrakerServer:
             self.logger.error(f"模拟器任务出错: {e}", exc_info=True)
     
     async def send(self, websocket, data):
-        """统一的发送方法，带日志记录"""
+        """统一的发送方法，带日志记录。data 为 dict，或已编码好的 str（如缓存的状态通知）"""
         try:
-            message = json.dumps(data)
+            message = data if isinstance(data, str) else dumps(data).decode()
             self.logger.info(f"发送 S->C: {message}")
             await websocket.send(message)
         except websockets.exceptions.ConnectionClosed:
@@ -741,17 +861,17 @@ async def _test_klipper_worker():
 
     await asyncio.sleep(1)
     print("test send gcode ...")
-    await klipper_worker.send_gcode("G28 ; home all axes")
+    klipper_worker.send_gcode("G28 ; home all axes")
     print("\n" + "-"*40 + "\n")
 
     await asyncio.sleep(1)
     print("test set temperature ...")
-    await klipper_worker.set_temperature(200)
+    klipper_worker.set_temperature(200)
     print("\n" + "-"*40 + "\n")
 
     await asyncio.sleep(1)
     print("test send subscribe message ...")
-    await klipper_worker.subscribe_printer_status()
+    klipper_worker.subscribe_printer_status()
 
     await asyncio.sleep(5)
     print("\n" + "-"*40 + "\n")
@@ -764,8 +884,7 @@ async def _test_klipper_worker():
     """
     with open(file_path, "w") as f:
         f.write(gcode)
-    klipper_worker.upload_gcode_to_klipper(file_path, print_after_upload=False)
-    os.remove(file_path)
+    await klipper_worker.upload_gcode_to_klipper(file_path, print_after_upload=False)
     await asyncio.sleep(2)
     print("\n" + "-"*40 + "\n")
 
@@ -784,7 +903,15 @@ if __name__ == "__main__":
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[logging.StreamHandler(sys.stdout)] # 确保输出到 stdout
     )
+    # GUI 中事件循环由 qasync 接管，不能替换；单独运行本模块时使用基于 libuv 的 uvloop / winloop（如已安装）
+    try:
+        if sys.platform == "win32":
+            from winloop import run as run_loop
+        else:
+            from uvloop import run as run_loop
+    except ImportError:
+        run_loop = asyncio.run
     try:
-        asyncio.run(main())
+        run_loop(main())
     except KeyboardInterrupt:
         print("程序被用户中断。")
\ No newline at end of file
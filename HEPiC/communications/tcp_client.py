@@ -3,12 +3,28 @@ from dataclasses import dataclass
 import asyncio
 import json
 import logging
+import math
 import random
 import sys
 import time
 
 import numpy as np
 
+try:
+    from ..json_backend import loads, dumps
+except ImportError:
+    # run as a script (python tcp_client.py): no parent package, use the stdlib parser
+    from json import loads
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+# Fixed requests are encoded once at import, not on every send.
+_GET_SENSOR_CONFIG_FRAME = dumps({"message_type": "get_sensor_config"}) + b"\n"
+
+# Longest accepted line, the same 64 KiB limit StreamReader.readline() applied.
+_MAX_LINE_LENGTH = 2 ** 16
+
 try:
     from PySide6.QtCore import QObject, Signal, Slot
 except ImportError:
@@ -37,29 +53,147 @@ except ImportError:
 class SensorData:
     name: str
     can_zero: bool = False
-    raw_value: float = np.nan
+    raw_value: float = math.nan
     offset: float = 0.0
-    value: float = np.nan
+    value: float = math.nan
+    has_value: bool = False  # False until a reading arrives, and again after a null or a disconnect
 
     def update(self, raw_value):
         if raw_value is None:
-            self.raw_value = np.nan
-            self.value = np.nan
+            self.invalidate()
             return
         self.raw_value = float(raw_value)
         self.value = self.raw_value - self.offset
+        self.has_value = not math.isnan(self.raw_value)  # the stdlib parser accepts a NaN literal
+
+    def invalidate(self):
+        self.raw_value = math.nan
+        self.value = math.nan
+        self.has_value = False
 
     def zero(self) -> bool:
         if not self.can_zero:
             print(f"Sensor {self.name} is not zeroable.")
             return False
-        if np.isnan(self.raw_value):
+        if not self.has_value:
             return False
         self.offset = self.raw_value
         self.value = 0.0
         return True
 
 
+class _LineProtocol(asyncio.Protocol):
+    """Newline-delimited JSON framing on top of an asyncio transport.
+
+    data_received splits the byte stream on b"\n" and hands each line to
+    ``on_line`` directly, without the StreamReader/readline() layer. The
+    protocol also exposes the small writer surface TCPClient uses
+    (write/drain/close/wait_closed); drain() only waits while the transport
+    has paused writing.
+
+    A line longer than ``max_line_length`` closes the connection, so a peer
+    that never sends b"\n" cannot grow the buffer without bound.
+    """
+
+    def __init__(self, on_line, max_line_length: int = _MAX_LINE_LENGTH):
+        self._on_line = on_line
+        self._max_line_length = max_line_length
+        self._loop = asyncio.get_running_loop()
+        self._buf = bytearray()
+        self._scan_pos = 0  # bytes of _buf already searched for b"\n"
+        self._paused = False
+        # one future per concurrent drain() caller (send_data and send_json can
+        # both wait while writing is paused), as in asyncio's FlowControlMixin
+        self._drain_waiters: deque[asyncio.Future] = deque()
+        self.transport: asyncio.Transport | None = None
+        self.last_data = self._loop.time()
+        self.closed: asyncio.Future = self._loop.create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.last_data = self._loop.time()
+
+    def data_received(self, data):
+        self.last_data = self._loop.time()
+        buf = self._buf
+        buf += data
+        # Resume the search where the previous chunk left off, so a long frame
+        # arriving in many chunks is scanned once instead of once per chunk.
+        end = buf.find(b"\n", self._scan_pos)
+        if end < 0:
+            self._scan_pos = len(buf)
+            if len(buf) > self._max_line_length:
+                self._line_too_long()
+            return
+        start = 0
+        while end >= 0:
+            if end - start > self._max_line_length:
+                self._line_too_long()
+                return
+            self._on_line(buf[start:end])
+            start = end + 1
+            end = buf.find(b"\n", start)
+        del buf[:start]
+        self._scan_pos = len(buf)
+        if len(buf) > self._max_line_length:
+            self._line_too_long()
+
+    def _line_too_long(self):
+        logging.getLogger(__name__).warning(
+            f"Line exceeds {self._max_line_length} bytes without a newline, closing connection."
+        )
+        self._buf.clear()
+        self._scan_pos = 0
+        self.close()
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+        self._wake_drain(exc or ConnectionResetError("Connection lost"))
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wake_drain(None)
+
+    def _wake_drain(self, exc):
+        waiters = self._drain_waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if waiter.done():
+                continue
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
+
+    def write(self, data: bytes):
+        self.transport.write(data)
+
+    async def drain(self):
+        if self.closed.done():
+            raise ConnectionResetError("Connection lost")
+        if not self._paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            # a caller cancelled by its send_timeout leaves the queue here
+            if waiter in self._drain_waiters:
+                self._drain_waiters.remove(waiter)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    async def wait_closed(self):
+        await asyncio.shield(self.closed)
+
+
 class TCPClient(QObject):
     connection_status = Signal(str)
     connected = Signal(int)
@@ -82,15 +216,13 @@ class TCPClient(QObject):
         super().__init__()
         self.host = host
         self.port = port
-        self.is_running = True
+        self._stop_evt = asyncio.Event()  # set by stop(); wakes the reconnect wait at once
 
         self.send_timeout = send_timeout
         self.reconnect_base_delay = reconnect_base_delay
         self.reconnect_max_delay = reconnect_max_delay
         self._reconnect_attempts = 0
 
-        self.queue: asyncio.Queue = asyncio.Queue()
-
         # Backward-compatible public states used by UI.
         self.extrusion_force = np.nan
         self.extrusion_force_offset = 0.0
@@ -102,9 +234,13 @@ class TCPClient(QObject):
         self.steps_total = rotary_encoder_steps_total
         self.wheel_diameter = rotary_encoder_wheel_diameter
 
+        # Preallocated ring buffers for the velocity window: one slot per
+        # meter_count sample, no per-sample Python object in a deque.
         self.cache_size = meter_count_cache_size
-        self.meter_count_cache = deque(maxlen=self.cache_size)
-        self.time_cache = deque(maxlen=self.cache_size)
+        self._mc_buf = np.empty(self.cache_size, dtype=np.float64)
+        self._t_buf = np.empty(self.cache_size, dtype=np.int64)  # time.monotonic_ns()
+        self._buf_idx = 0
+        self._buf_filled = False
         self.filament_velocity = 0.0
         self.read_timeout = read_timeout
 
@@ -112,20 +248,23 @@ class TCPClient(QObject):
         self.sensor_columns: list[str] = []
         self.sensor_data_map: dict[str, SensorData] = {}
 
-        self.reader: asyncio.StreamReader | None = None
-        self.writer: asyncio.StreamWriter | None = None
+        self.writer: _LineProtocol | None = None
         self.sensor_config: dict | None = None
+        self._zeroable_by_name: dict[str, bool] = {}  # built once per sensor_config
 
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def is_running(self) -> bool:
+        return not self._stop_evt.is_set()
+
     async def run(self):
         while self.is_running:
             try:
-                while not self.queue.empty():
-                    self.queue.get_nowait()
-
-                self.reader, self.writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port), timeout=2.0
+                loop = asyncio.get_running_loop()
+                _transport, self.writer = await asyncio.wait_for(
+                    loop.create_connection(lambda: _LineProtocol(self._on_line), self.host, self.port),
+                    timeout=2.0,
                 )
                 self.logger.info(f"HEPiC server connected: {self.host}:{self.port}")
                 self.connection_status.emit(f"HEPiC server 已连接 ({self.host}:{self.port})")
@@ -133,19 +272,10 @@ class TCPClient(QObject):
 
                 await self.request_sensor_config()
                 self.receive_task = asyncio.create_task(self.receive_data())
-                self.process_task = asyncio.create_task(self.process_data())
-                _done, pending = await asyncio.wait(
-                    [self.receive_task, self.process_task],
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
+                # wait() rather than await: a stop() cancelling the task must not raise here
+                await asyncio.wait([self.receive_task])
 
-                self.logger.warning("Connection interrupted, cleaning tasks...")
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
+                self.logger.warning("Connection interrupted.")
 
             except Exception as e:
                 self.logger.error(f"TCP client error: {e}")
@@ -159,19 +289,17 @@ class TCPClient(QObject):
                     except Exception:
                         pass
                     self.writer = None
-                self.reader = None
 
             if self.is_running:
                 delay = self._next_reconnect_delay()
                 self.connection_status.emit(
                     f"hepic_server disconnected, reconnecting in {delay:.0f}s..."
                 )
-                # Sleep in short chunks so stop()/is_running is honoured promptly.
-                remaining = delay
-                while remaining > 0 and self.is_running:
-                    step = min(1.0, remaining)
-                    await asyncio.sleep(step)
-                    remaining -= step
+                # One status update per reconnect, then a single wait that stop() interrupts.
+                try:
+                    await asyncio.wait_for(self._stop_evt.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
 
     async def send_data(self, message: str):
         if not self.writer:
@@ -187,13 +315,14 @@ class TCPClient(QObject):
             self.logger.warning(f"Send failed, dropping connection to reconnect: {e}")
             self._close_writer_safely()
 
-    async def send_json(self, message: dict):
+    async def send_json(self, message: dict | bytes):
+        """Send one JSON message; ``message`` may also be an already encoded frame ending in b"\\n"."""
         if not self.writer:
             self.logger.info("Connection not established; cannot send json.")
             return
 
         try:
-            data_to_send = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+            data_to_send = message if isinstance(message, bytes) else dumps(message) + b"\n"
             self.writer.write(data_to_send)
             await asyncio.wait_for(self.writer.drain(), timeout=self.send_timeout)
         except Exception as e:
@@ -201,7 +330,7 @@ class TCPClient(QObject):
             self._close_writer_safely()
 
     async def request_sensor_config(self):
-        await self.send_json({"message_type": "get_sensor_config"})
+        await self.send_json(_GET_SENSOR_CONFIG_FRAME)
         self.logger.info("Requested sensor_config from server.")
 
     def _normalize_message(self, message: object) -> dict:
@@ -232,29 +361,30 @@ class TCPClient(QObject):
             deduped.append(col)
         return deduped
 
+    def _build_zeroable_lookup(self, sensor_config_payload: dict) -> dict[str, bool]:
+        lookup: dict[str, bool] = {}
+        for item in sensor_config_payload.get("sensors", []):
+            if not isinstance(item, dict):
+                continue
+            name = item.get("name")
+            if name is not None and name not in lookup:
+                lookup[name] = bool(item.get("zeroable", False))
+        return lookup
+
     def _is_zeroable_sensor(self, sensor_name: str) -> bool:
-        if self.sensor_config is not None:
-            for item in self.sensor_config.get("sensors", []):
-                if not isinstance(item, dict):
-                    continue
-                name = item.get("name")
-                if name == sensor_name:
-                    return bool(item.get("zeroable", False))
-        else:
+        if self.sensor_config is None:
             self.logger.info(f"Sensor config not received yet, cannot determine if {sensor_name} is zeroable.")
             return False
+        return self._zeroable_by_name.get(sensor_name, False)
 
     def _ensure_sensor(self, sensor_name: str):
+        # Per-message path: a dict lookup only. Zeroability of existing sensors
+        # is refreshed when a sensor_config arrives, not on every data message.
         if sensor_name not in self.sensor_data_map:
             self.sensor_data_map[sensor_name] = SensorData(
                 name=sensor_name,
                 can_zero=self._is_zeroable_sensor(sensor_name),
             )
-            return
-
-        sensor = self.sensor_data_map[sensor_name]
-        if not sensor.can_zero:
-            sensor.can_zero = self._is_zeroable_sensor(sensor_name)
 
     def _filter_payload_by_sensor_columns(self, payload: dict) -> dict:
         if not self.sensor_columns:
@@ -264,8 +394,7 @@ class TCPClient(QObject):
     def _invalidate_sensor_data(self) -> None:
         """Set all sensor values to nan while disconnected to prevent stale readings."""
         for sensor in self.sensor_data_map.values():
-            sensor.raw_value = np.nan
-            sensor.value = np.nan
+            sensor.invalidate()
         if self.sensor_data_map:
             self.latest_sensor_data = {name: np.nan for name in self.sensor_data_map}
         self.filament_velocity = 0.0
@@ -292,84 +421,94 @@ class TCPClient(QObject):
         self._reconnect_attempts = 0
 
     async def receive_data(self):
+        """Watch the connection: return on EOF/reset or after read_timeout without data.
+
+        Lines are parsed and handled by the protocol's data_received callback
+        (see _on_line), so this task only wakes up when the link goes quiet.
+        """
+        protocol = self.writer
+        if protocol is None:
+            return
+        loop = asyncio.get_running_loop()
         try:
             while self.is_running:
-                if self.reader is None:
-                    break
-                try:
-                    data = await asyncio.wait_for(self.reader.readline(), timeout=self.read_timeout)
-                except asyncio.TimeoutError:
+                idle = loop.time() - protocol.last_data
+                if idle >= self.read_timeout:
                     self.logger.warning(f"No data received for {self.read_timeout}s, reconnecting.")
                     self.connection_status.emit("Data timeout, reconnecting...")
                     break
-                if not data:
-                    raise ConnectionResetError("Socket closed by server")
-
-                # A single malformed message must NOT tear down a healthy
-                # connection: decode/parse per message and skip bad ones.
                 try:
-                    message_str = data.decode("utf-8").strip()
-                    if not message_str:
-                        continue
-                    message_dict = json.loads(message_str)
-                except (UnicodeDecodeError, json.JSONDecodeError) as e:
-                    self.logger.warning(f"Skipping malformed message: {e}")
+                    await asyncio.wait_for(asyncio.shield(protocol.closed), timeout=self.read_timeout - idle)
+                except asyncio.TimeoutError:
                     continue
-
-                await self.queue.put(self._normalize_message(message_dict))
+                raise ConnectionResetError("Socket closed by server")
         except (ConnectionResetError, ConnectionAbortedError):
             self.logger.warning("Connection reset/aborted.")
             self.connection_status.emit("Connection lost")
         except Exception as e:
             self.logger.error(f"Receive error: {e}")
 
-    async def process_data(self):
+    def _on_line(self, line: bytearray):
+        # A single malformed message must NOT tear down a healthy
+        # connection: parse per message and skip bad ones.
+        if not line or line.isspace():
+            return
         try:
-            while self.is_running:
+            # the parser takes the raw line; surrounding whitespace (e.g. "\r") is fine
+            message_dict = loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Skipping malformed message: {e}")
+            return
+
+        # Messages are handled inline: a handful of arithmetic ops per
+        # message does not justify a queue hop to a second task.
+        try:
+            self._handle_message(self._normalize_message(message_dict))
+        except Exception as e:
+            self.logger.error(f"Error handling message: {e}")
+
+    def _handle_message(self, message: dict):
+        # lazy %-formatting: the message repr is only built when DEBUG is enabled
+        self.logger.debug("Processing message: %s", message)
+
+        message_type = message.get("message_type")
+        payload = message.get("payload")
+
+        if message_type == "sensor_config" and isinstance(payload, dict):
+            self.logger.info("Received sensor_config from server.")
+            self.sensor_columns = self._extract_sensor_columns(payload)
+            self.sensor_config = payload
+            self._zeroable_by_name = self._build_zeroable_lookup(payload)
+            for sensor in self.sensor_data_map.values():
+                if not sensor.can_zero:
+                    sensor.can_zero = self._is_zeroable_sensor(sensor.name)
+            for sensor_name in self.sensor_columns:
+                self._ensure_sensor(sensor_name)
+
+            self.sensor_config_received.emit(self.sensor_columns)
+
+        if message_type == "sensor_data" and isinstance(payload, dict):
+            filtered_payload = self._filter_payload_by_sensor_columns(payload)
+            processed_payload: dict[str, float] = {}
+
+            for sensor_name, raw_value in filtered_payload.items():
                 try:
-                    message = await self.queue.get()
-                    self.logger.debug(f"Processing message: {message}")
-
-                    message_type = message.get("message_type")
-                    payload = message.get("payload")
-
-                    if message_type == "sensor_config" and isinstance(payload, dict):
-                        self.logger.info("Received sensor_config from server.")
-                        self.sensor_columns = self._extract_sensor_columns(payload)
-                        self.sensor_config = payload
-                        for sensor_name in self.sensor_columns:
-                            self._ensure_sensor(sensor_name)
-                        
-                        self.sensor_config_received.emit(self.sensor_columns)
-                        
-
-                    if message_type == "sensor_data" and isinstance(payload, dict):
-                        filtered_payload = self._filter_payload_by_sensor_columns(payload)
-                        processed_payload: dict[str, float] = {}
-
-                        for sensor_name, raw_value in filtered_payload.items():
-                            try:
-                                self._ensure_sensor(sensor_name)
-                                sensor = self.sensor_data_map[sensor_name]
-                                sensor.update(raw_value)
-                                processed_payload[sensor_name] = sensor.value
-                            except Exception as e:
-                                self.logger.error(f"Invalid sensor value ignored ({sensor_name}): {e}")
-
-                        if "meter_count_mm" in processed_payload:
-                            self.meter_count = processed_payload["meter_count_mm"]
-                            self.compute_filament_velocity()
-                        processed_payload["measured_feedrate_mms"] = self.filament_velocity
-
-                        self.latest_sensor_data = processed_payload
-
-                    self.queue.task_done()
+                    self._ensure_sensor(sensor_name)
+                    sensor = self.sensor_data_map[sensor_name]
+                    sensor.update(raw_value)
+                    processed_payload[sensor_name] = sensor.value
                 except Exception as e:
-                    self.logger.error(f"Error in process_data: {e}")
-        except asyncio.CancelledError:
-            self.logger.debug("Process data task cancelled.")
+                    self.logger.error(f"Invalid sensor value ignored ({sensor_name}): {e}")
+
+            if "meter_count_mm" in processed_payload:
+                self.meter_count = processed_payload["meter_count_mm"]
+                self.compute_filament_velocity()
+            processed_payload["measured_feedrate_mms"] = self.filament_velocity
+
+            self.latest_sensor_data = processed_payload
 
 
+    @Slot(str)
     def zero_sensor(self, sensor_name: str):
         sensor = self.sensor_data_map.get(sensor_name)
         if not sensor:
@@ -398,39 +537,45 @@ class TCPClient(QObject):
         return labels
 
     def compute_filament_velocity(self):
-        if np.isnan(self.meter_count):
-            self.filament_velocity = np.nan
+        if math.isnan(self.meter_count):
+            self.filament_velocity = math.nan
             return
 
-        self.meter_count_cache.append(self.meter_count)
-        self.time_cache.append(time.time())
-
-        if len(self.meter_count_cache) == self.cache_size:
-            delta_meter = self.meter_count_cache[self.cache_size - 1] - self.meter_count_cache[0]
-            delta_time = self.time_cache[self.cache_size - 1] - self.time_cache[0]
-            try:
-                if delta_time <= 0:
-                    self.filament_velocity = np.nan
-                else:
-                    self.filament_velocity = delta_meter / delta_time
-            except Exception as e:
-                self.logger.error(f"Velocity compute error: {e}")
-                self.filament_velocity = np.nan
+        newest = self._buf_idx
+        self._mc_buf[newest] = self.meter_count
+        self._t_buf[newest] = time.monotonic_ns()
+        self._buf_idx = (newest + 1) % self.cache_size
+        if self._buf_idx == 0:
+            self._buf_filled = True
+
+        if self._buf_filled:
+            # the next slot to be written holds the oldest sample
+            oldest = self._buf_idx
+            delta_meter = float(self._mc_buf[newest] - self._mc_buf[oldest])
+            delta_time_ns = int(self._t_buf[newest] - self._t_buf[oldest])
+            # monotonic: never negative, but a coarse clock can return the same tick twice
+            if delta_time_ns == 0:
+                self.filament_velocity = math.nan
+            else:
+                self.filament_velocity = delta_meter / (delta_time_ns * 1e-9)
         else:
             self.filament_velocity = 0.0
 
     @Slot()
     def stop(self):
-        self.is_running = False
+        self._stop_evt.set()
 
         if hasattr(self, "receive_task"):
             self.receive_task.cancel()
-        if hasattr(self, "process_task"):
-            self.process_task.cancel()
         if self.writer:
             self.writer.close()
 
 
+_MOCK_SENSOR_DATA_TEMPLATE = (
+    b'{"message_type":"sensor_data","payload":{"extrusion_force_N":%r,"meter_count_mm":%r}}\n'
+)
+
+
 async def mock_data_sender(_reader, writer):
     addr = writer.get_extra_info("peername")
     print(f"Accept connection from {addr}")
@@ -442,14 +587,8 @@ async def mock_data_sender(_reader, writer):
             try:
                 extrusion_force = 2 + random.uniform(-0.2, 0.2)
                 meter_count = 2 + random.uniform(-0.2, 0.2)
-                message = {
-                    "message_type": "sensor_data",
-                    "payload": {
-                        "extrusion_force_N": extrusion_force,
-                        "meter_count_mm": meter_count,
-                    },
-                }
-                data_to_send = json.dumps(message).encode("utf-8") + b"\n"
+                # fixed schema: fill a bytes template instead of encoding a dict each tick
+                data_to_send = _MOCK_SENSOR_DATA_TEMPLATE % (extrusion_force, meter_count)
                 writer.write(data_to_send)
                 await writer.drain()
                 await asyncio.sleep(0.1)
@@ -488,7 +627,17 @@ if __name__ == "__main__":
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
+    # In the GUI the loop belongs to qasync and cannot be swapped; standalone runs
+    # use the libuv-based uvloop / winloop when installed. The gain is in socket
+    # I/O callbacks, not in the Python-level message handling.
+    try:
+        if sys.platform == "win32":
+            from winloop import run as run_loop
+        else:
+            from uvloop import run as run_loop
+    except ImportError:
+        run_loop = asyncio.run
     try:
-        asyncio.run(main())
+        run_loop(main())
     except KeyboardInterrupt:
         print("Test interrupted.")
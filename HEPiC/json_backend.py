@@ -0,0 +1,43 @@
+"""JSON backend shared by config loading and the communication workers.
+
+Uses `orjson` when it is installed and falls back to the standard library
+otherwise. Both functions work on bytes so callers can hand over what they
+read from a file or socket without decoding it first.
+
+orjson rejects the `NaN` / `Infinity` literals that the stdlib `json.dumps`
+on the sensor server writes, so `loads` retries those documents with the
+stdlib parser and both backends parse the same input.
+"""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def loads(data):
+        """Parse JSON bytes or str. Documents orjson rejects (e.g. a NaN literal) are retried with the stdlib parser."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # the stdlib error subclasses the same json.JSONDecodeError, so
+            # existing `except json.JSONDecodeError` clauses keep working
+            return json.loads(data)
+
+    def dumps(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes. Note that orjson writes nan as null."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+else:
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
@@ -3,21 +3,31 @@ from PySide6.QtWidgets import (
     QLineEdit, QPushButton, QPlainTextEdit
 )
 from PySide6.QtCore import Signal, Slot, Qt
-from PySide6.QtGui import QColor, QTextCharFormat, QTextCursor
-from datetime import datetime
+import html
 import logging
+from collections import deque
+from .minute_clock import MinuteClock
 
 class CommandWidget(QWidget):
 
     command = Signal(str)
 
-    def __init__(self):
+    def __init__(self, max_block_count=2000):
+        """
+        Parameters
+        ----------
+        max_block_count : int
+            显示区最多保留的行数，超出后自动丢弃最早的行，避免长时间运行后文档无限增长、追加越来越慢。0 表示不限制。
+        """
 
         super().__init__()
 
         # layout
         self.command_display = QPlainTextEdit()
         self.command_display.setReadOnly(True)
+        self.command_display.setMaximumBlockCount(max_block_count)
+        # 只读日志不需要撤销栈，否则每次追加都会记录一条撤销命令
+        self.command_display.setUndoRedoEnabled(False)
         self.command_display.setStyleSheet("color: #a9b7c6; font-family: Consolas, monaco, monospace;")
         self.command_input = CommandInput()
         self.command_input.setPlaceholderText("输入 G-code 指令 (如 G1 E10 F300)")
@@ -40,15 +50,24 @@ class CommandWidget(QWidget):
 
         # constants
         self.colors = {
-            "error": QColor("#f44336"),   # 红色 !!
-            "info":  QColor("#bdbdbd"),   # 灰色 //
-            "action": QColor("#ff9800"),  # 橙色 action:
-            "command": QColor("#4caf50"), # 绿色 (用户发送的指令)
-            "normal": QColor("#ffffff")   # 白色
+            "error": "#f44336",   # 红色 !!
+            "info":  "#bdbdbd",   # 灰色 //
+            "action": "#ff9800",  # 橙色 action:
+            "command": "#4caf50", # 绿色 (用户发送的指令)
+            "normal": "#ffffff"   # 白色
         }
+        # 每种消息类型的 HTML 前缀只拼一次；white-space:pre-wrap 保留消息中的换行和连续空格
+        self.html_prefix = {
+            msg_type: f'<span style="white-space:pre-wrap; color:{color}">'
+            for msg_type, color in self.colors.items()
+        }
+        self.timestamp_prefix = '<span style="white-space:pre-wrap; color:#999999">'
 
         # variables
         self.command_cache = []
+        self._clock = MinuteClock()
+        # 控件不可见（例如切到其他标签页）时先缓存消息，显示时一次性追加
+        self._pending = deque(maxlen=max_block_count or None)
 
         # logger
         self.logger = logging.getLogger(__name__)
@@ -74,6 +93,7 @@ class CommandWidget(QWidget):
             # cache command for later use
             self.command_cache.append(command)
     
+    @Slot()
     def on_prev_clicked(self):
         """Roll back to previously sent command."""
         if self.command_cache:
@@ -100,28 +120,31 @@ class CommandWidget(QWidget):
             # 假设你自己发送的指令回显以 > 开头
             msg_type = "command"
         
-        # 2. 获取对应的颜色格式
-        color = self.colors.get(msg_type, self.colors["normal"])
-        tf = QTextCharFormat()
-        tf.setForeground(color)
-        timestamp_tf = QTextCharFormat()
-        timestamp_tf.setForeground(QColor("#999999"))
-
-        # 3. 移动光标到末尾并插入文本
-        cursor = self.command_display.textCursor()
-        cursor.movePosition(QTextCursor.End)
-
         # time stamp
-        now = datetime.now()
-        time_str = now.strftime("%H:%M")
-                
-        # 插入带格式的文本
-        cursor.insertText(f"{time_str}  ", timestamp_tf)
-        cursor.insertText(f"{message}\n", tf)
-        
-        # 4. 自动滚动到底部
-        self.command_display.setTextCursor(cursor)
-        self.command_display.ensureCursorVisible()
+        time_str = self._clock.now()
+
+        # 2. 以一段带颜色的 HTML 追加到末尾：不再为每条消息创建 QTextCharFormat、移动光标
+        #    appendHtml 在滚动条位于底部时会自动滚动到底部
+        line = (
+            f"{self.timestamp_prefix}{time_str}  </span>"
+            f"{self.html_prefix[msg_type]}{html.escape(message)}</span>"
+        )
+        if not self.isVisible():
+            self._pending.append(line)
+            return
+        self.command_display.appendHtml(line)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._flush_pending()
+
+    def _flush_pending(self):
+        """把隐藏期间缓存的消息合成一段 HTML 一次追加，每条消息仍是单独的一行（block）"""
+        if not self._pending:
+            return
+        batch = "".join(f'<p style="margin:0">{line}</p>' for line in self._pending)
+        self._pending.clear()
+        self.command_display.appendHtml(batch)
 
     def set_background_color(self, color):
         """设置背景颜色"""
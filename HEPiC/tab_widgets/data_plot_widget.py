@@ -1,17 +1,29 @@
 import logging
-from itertools import islice
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import QTimer, Slot
 from PySide6.QtWidgets import QCheckBox, QHBoxLayout, QVBoxLayout, QWidget
 import pyqtgraph as pg
 
+from ..utils import RingBuffer
+
 
 class DataPlotWidget(QWidget):
-    def __init__(self, logger=None, line_width=2, time_window_s=60):
+    def __init__(self, logger=None, line_width=2, time_window_s=60, max_points=10000, min_redraw_interval_ms=50):
         super().__init__()
         self.logger = logger or logging.getLogger(__name__)
         self.time_window_s = time_window_s
         self.line_width = line_width
+        self.max_points = max_points
+        # local copy of the recent rows, fed incrementally by update_display
+        self.buffer = RingBuffer([], self.max_points)
+
+        # redraw throttle: the first update draws at once, updates arriving
+        # within the interval are coalesced into one trailing redraw
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(min_redraw_interval_ms)
+        self._redraw_timer.timeout.connect(self._on_redraw_timer)
+        self._redraw_pending = False
 
         self.sensor_items: list[str] = []
         self.sensor_labels: dict[str, str] = {}
@@ -31,6 +43,9 @@ class DataPlotWidget(QWidget):
             "#1abc9c",
             "#d35400",
         ]
+        # one pen per pool colour, built once and shared by every curve using it
+        # (mkPen returns cosmetic pens, so the width is not rescaled with the view)
+        self.pen_pool = [pg.mkPen(color, width=self.line_width) for color in self.color_pool]
 
         self.checkbox_layout = QHBoxLayout()
         self.checkbox_layout.setSpacing(12)
@@ -41,8 +56,8 @@ class DataPlotWidget(QWidget):
         layout.addLayout(self.plot_layout)
         self.setLayout(layout)
 
-    def _next_color(self, idx: int) -> str:
-        return self.color_pool[idx % len(self.color_pool)]
+    def _next_pen(self, idx: int):
+        return self.pen_pool[idx % len(self.pen_pool)]
 
     def set_sensor_items(self, sensor_items: list[str], sensor_labels: dict[str, str] | None = None):
         if sensor_labels is not None:
@@ -80,10 +95,12 @@ class DataPlotWidget(QWidget):
     def _add_plot(self, sensor_name: str):
         if sensor_name in self.plots:
             return
-        color = self._next_color(len(self.plots))
         display_name = self.sensor_labels.get(sensor_name, sensor_name)
         plot = pg.PlotWidget(title=display_name)
-        curve = plot.plot(pen=pg.mkPen(color, width=self.line_width))
+        curve = plot.plot(pen=self._next_pen(len(self.plots)))
+        # only draw what is visible, and at most ~one peak pair per pixel column
+        curve.setClipToView(True)
+        curve.setDownsampling(auto=True, method="peak")
         self.plots[sensor_name] = plot
         self.curves[sensor_name] = curve
         self.plot_layout.addWidget(plot)
@@ -95,40 +112,53 @@ class DataPlotWidget(QWidget):
             self.plot_layout.removeWidget(plot)
             plot.deleteLater()
 
-    @staticmethod
-    def _tail(seq, n: int) -> list:
-        """Return the last n items of seq in O(n) without copying the full sequence."""
-        return list(islice(reversed(seq), n))[::-1]
-
-    @Slot(dict)
-    def update_display(self, data: dict):
+    def clear_data(self):
+        """Drop the buffered rows, e.g. when MainWindow starts a new data session."""
+        self.buffer = RingBuffer([], self.max_points)
+        self._redraw_timer.stop()
+        self._redraw_pending = False
+        for curve in self.curves.values():
+            curve.setData([], [])
+
+    @Slot(list, object)
+    def update_display(self, columns, rows):
+        """Append the new rows to the local buffer and schedule a redraw."""
         try:
-            time_deque = data.get("time_s")
-            if not time_deque:
+            self.buffer.add_columns(columns)
+            self.buffer.extend(rows)
+        except Exception as e:
+            self.logger.error(f"data_plot_widget update error: {e}")
+            return
+        if self._redraw_timer.isActive():
+            self._redraw_pending = True
+            return
+        self._redraw()
+        self._redraw_timer.start()
+
+    @Slot()
+    def _on_redraw_timer(self):
+        if self._redraw_pending:
+            self._redraw_pending = False
+            self._redraw()
+            self._redraw_timer.start()
+
+    def _redraw(self):
+        """Redraw the trailing ``time_window_s`` seconds."""
+        try:
+            data = self.buffer
+            if not len(data) or "time_s" not in data:
                 return
 
-            latest_time = time_deque[-1]
-            cutoff = latest_time - self.time_window_s
-
-            # Count points within the time window by walking backwards (O(n_shown))
-            n = 0
-            for t in reversed(time_deque):
-                if t < cutoff:
-                    break
-                n += 1
-            if n == 0:
+            latest_time = data.latest("time_s")
+            window = data.tail_since("time_s", latest_time - self.time_window_s)
+            if not len(window):
                 return
 
-            x_data = self._tail(time_deque, n)
+            x_data = window[:, data.column_index("time_s")]
 
             for sensor_name, curve in self.curves.items():
-                y_deque = data.get(sensor_name)
-                if not y_deque:
-                    continue
-                y_data = self._tail(y_deque, n)
-                n_pts = min(len(x_data), len(y_data))
-                if n_pts <= 0:
+                if sensor_name not in data:
                     continue
-                curve.setData(x_data[:n_pts], y_data[:n_pts])
+                curve.setData(x_data, window[:, data.column_index(sensor_name)])
         except Exception as e:
             self.logger.error(f"data_plot_widget update error: {e}")
@@ -1,6 +1,5 @@
 from pathlib import Path
 import logging
-import pandas as pd
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QFileDialog, QSlider, QLabel
 )
@@ -8,7 +7,7 @@ from PySide6.QtCore import Qt
 import numpy as np
 import pyqtgraph as pg
 from .log_widget import LogWidget
-from ..utils import data_cleaning
+from ..utils import read_autosave
 
 class DataProcessorWidget(QWidget):
     def __init__(self):
@@ -18,7 +17,7 @@ class DataProcessorWidget(QWidget):
         self.plot_widget.setLabel("bottom", "进线速度", units="mm/s")
         self.plot_widget.setLabel("left", "挤出力", units="N")
         self.plot_widget.addLegend()
-        self.open_csv_button = QPushButton("打开文件（.csv）")
+        self.open_csv_button = QPushButton("打开文件（.csv / .arrows）")
         self.clean_button = QPushButton("清洗数据")
         self.export_button = QPushButton("导出结果")
         self.int_slider_label = QLabel("裁剪秒数: 0.0 s")
@@ -71,9 +70,9 @@ class DataProcessorWidget(QWidget):
     def open_csv_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Select a CSV file",
+            "Select an autosave file",
             "",
-            "CSV Files (*.csv)"
+            "Autosave Files (*.csv *.arrows)"
         )
 
         if not file_path:
@@ -81,7 +80,7 @@ class DataProcessorWidget(QWidget):
             return
 
         try:
-            self.df = pd.read_csv(file_path)
+            self.df = read_autosave(file_path)
             self.csv_file_path = file_path
             self.log_widget.update_log(
                 f"Loaded CSV file: {file_path} (rows={len(self.df)}, columns={len(self.df.columns)})"
@@ -96,7 +95,10 @@ class DataProcessorWidget(QWidget):
         if self.df is None:
             self.log_widget.update_log("No data to clean. Please load a CSV file first.")
             return
-   
+
+        # data_cleaning pulls in pandas, import it on first use to keep app startup fast
+        from ..utils import data_cleaning
+
         self.cleaned_steps, data_clean, step_length = data_cleaning.clean_data(self.df)
         self.log_widget.update_log(f"Data cleaned.")
         self.log_widget.update_log(f"Number of steps: {len(self.cleaned_steps)}")
@@ -111,6 +113,8 @@ class DataProcessorWidget(QWidget):
             self.log_widget.update_log("No cleaned data to plot. Please clean the data first.")
             return
         
+        from ..utils import data_cleaning
+
         stats = data_cleaning.extrusion_statistics(self.cleaned_steps, clip=self.clip_seconds)
         if stats.empty:
             self.log_widget.update_log("No statistics to plot after clipping.")
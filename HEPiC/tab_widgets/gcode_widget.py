@@ -1,9 +1,11 @@
 from pathlib import Path
+import os
+import tempfile
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QTextEdit, QLabel, QStyle
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QPlainTextEdit, QPlainTextDocumentLayout, QTextEdit, QLabel, QStyle
 )
-from PySide6.QtGui import QTextCursor, QTextCharFormat, QColor
+from PySide6.QtGui import QTextCursor, QTextCharFormat, QTextDocument, QColor, QFont
 from PySide6.QtCore import Signal, Slot, QSize, QObject
 from ..utils.gcode_position_mapper import GcodePositionMapper
 import time
@@ -13,7 +15,7 @@ from .job_sequence_dialog import JobSequenceDialog
 
 class GcodeWidget(QWidget):
 
-    sigGcode = Signal(str)
+    sigGcode = Signal(object) # str, passed by reference instead of converting to QString and back
     sigFilePath = Signal(str)
     sigCurrentLine = Signal(int)
     sigActiveGcode = Signal(str)
@@ -37,8 +39,15 @@ class GcodeWidget(QWidget):
         # """
         # self.warning_label.setToolTip(tooltip_text)
         self.gcode_title.setMaximumWidth(300)
-        self.gcode_display = QTextEdit()
+        # QPlainTextEdit: line-based plain-text layout, much cheaper than QTextEdit's rich text for long G-code files
+        self.gcode_display = QPlainTextEdit()
         self.gcode_display.setReadOnly(True)
+        # 只在编辑模式下保留撤销栈
+        self.gcode_display.setUndoRedoEnabled(False)
+        self.gcode_display.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        mono_font = QFont("Consolas")
+        mono_font.setStyleHint(QFont.StyleHint.Monospace)
+        self.gcode_display.setFont(mono_font)
         # self.gcode_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.open_button = QPushButton("打开")
         self.run_button = QPushButton("运行")
@@ -68,18 +77,27 @@ class GcodeWidget(QWidget):
         self.run_button.clicked.connect(self.on_click_run)
         self.sigCurrentLine.connect(self.highlight_current_line)
         self.gen_button.clicked.connect(self.on_click_gen)
-        # self.sigCurrentLine.connect(self.reset_line_highlight)
 
         # variables
         self.file_path = None
+        self.gcode = None
         self.mapper = None
         self.highlight_color = hightlight_color
 
+        # 高亮用的格式和选区只创建一次，每次换行只更新 cursor
+        self._highlight_format = QTextCharFormat()
+        self._highlight_format.setBackground(QColor(self.highlight_color))
+        # 必须设置这个属性才能让高亮填满整行
+        self._highlight_format.setProperty(QTextCharFormat.FullWidthSelection, True)
+        self._highlight_selection = QTextEdit.ExtraSelection()
+        self._highlight_selection.format = self._highlight_format
+
         # logger
         self.logger = logging.getLogger(__name__)
 
     def on_toggle_edit(self, checked):
         self.gcode_display.setReadOnly(not checked)
+        self.gcode_display.setUndoRedoEnabled(checked)
         self.edit_button.setText("✅" if checked else "✏️")
 
     def on_click_open(self):
@@ -93,21 +111,30 @@ class GcodeWidget(QWidget):
 
         if file_path:
             self.logger.info(f"选择的文件路径是: {file_path}")
-            with open(file_path, "r") as f:
-                gcode = f.read()
-                self.set_gcode(gcode)         
+            # 一次读入字节：映射表直接用原始字节建立，文本只解码一次用于显示
+            raw = Path(file_path).read_bytes()
+            try:
+                gcode = raw.decode("utf-8")
+            except UnicodeDecodeError as e:
+                self.logger.error(f"G-code 文件不是 UTF-8 编码: {e}")
+                return
+            self.set_gcode(gcode, raw)
         else:
             self.logger.info("没有选择任何文件")
             return
 
     def on_click_run(self):
-        self.gcode = self.gcode_display.toPlainText()
-        self.mapper = GcodePositionMapper(self.gcode)
-        self.gcode_list = self.gcode.splitlines()
+        gcode = self.gcode_display.toPlainText()
+        if gcode != self.gcode: # 文本被编辑过才重建映射表
+            self.gcode = gcode
+            self.mapper = GcodePositionMapper(self.gcode)
+            self.gcode_list = self.gcode.splitlines()
 
-        self.file_path = Path(__file__).resolve().parent / "tmp.gcode"
-        with open(self.file_path, "w", encoding="utf-8") as f:
+        # 每次运行写入独立的临时文件：上传是异步的，再次点击运行不能改写或删除仍在上传的文件
+        fd, file_path = tempfile.mkstemp(prefix="hepic_", suffix=".gcode")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             f.write(self.gcode)
+        self.file_path = Path(file_path)
         self.sigFilePath.emit(str(self.file_path))
     
     def on_click_gen(self):
@@ -120,63 +147,52 @@ class GcodeWidget(QWidget):
             self.logger.info("用户取消了输入")
     
     def display_gcode(self):
-        self.gcode_display.setPlainText(self.gcode)
+        # 大文件整体载入：先在未挂载的文档里填好文本，再整体换上去，
+        # 避免在可见的文档上边插入边排版；换文档期间暂停重绘和信号，完成后只重绘一次
+        display = self.gcode_display
+        doc = QTextDocument(display)
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setUndoRedoEnabled(not display.isReadOnly())
+        doc.setDefaultFont(display.font())
+        doc.setPlainText(self.gcode)
+
+        # 控件自带的初始文档会在 setDocument 时被 Qt 删除，之前换上的文档（父对象是 display）需自行释放
+        old_doc = display.document()
+        owned_old_doc = old_doc.parent() is display
+        display.setUpdatesEnabled(False)
+        display.blockSignals(True)
+        try:
+            display.setExtraSelections([]) # 旧高亮指向旧文档
+            display.setDocument(doc)
+        finally:
+            display.blockSignals(False)
+            display.setUpdatesEnabled(True)
+            display.viewport().update()
+        if owned_old_doc:
+            old_doc.deleteLater()
     
-    def set_gcode(self, gcode):
+    def set_gcode(self, gcode, raw=None):
+        """显示 gcode 并建立行号映射表。raw 为文件原始字节（可选），有则直接用于建立映射表。"""
         self.gcode = gcode
         # emit gcode
         self.sigGcode.emit(self.gcode)
         
         self.display_gcode()
         # create gcode position mapper
-        self.mapper = GcodePositionMapper(self.gcode)
+        self.mapper = GcodePositionMapper(self.gcode if raw is None else raw)
         
         self.gcode_list = self.gcode.splitlines()
 
     @Slot(int)
     def highlight_current_line(self, line_number):
-        manual_selection = QTextEdit.ExtraSelection()
-            
-        # 设置高亮格式 (背景色)
-        manual_format = QTextCharFormat()
-        manual_format.setBackground(QColor(self.highlight_color))
-        # <<< 关键改动 1: 必须设置这个属性才能让高亮填满整行
-        manual_format.setProperty(QTextCharFormat.FullWidthSelection, True)
-        manual_selection.format = manual_format
-
         # 定位到指定行
         doc = self.gcode_display.document()
         block = doc.findBlockByNumber(line_number)
         
         if block.isValid():
-            cursor = QTextCursor(block)
-            manual_selection.cursor = cursor
-            selections = [manual_selection]
-            self.gcode_display.setExtraSelections(selections)
+            self._highlight_selection.cursor = QTextCursor(block)
+            self.gcode_display.setExtraSelections([self._highlight_selection])
         
-    @Slot(int)
-    def reset_line_highlight(self, line_number):
-        """将高亮 gcode 恢复为普通样式。注意，这里接收的 line_number 仍然是当前执行行，所以 cursor 需要选择到 line_number-1 行进行操作。"""
-        
-        if line_number > 1:
-            self.logger.debug(f"reset line {line_number}")
-            cursor = self.gcode_display.textCursor()
-            cursor.movePosition(QTextCursor.StartOfBlock)
-            for i in range(line_number-1):
-                cursor.movePosition(QTextCursor.NextBlock)
-            cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor)
-            
-            # 恢复普通样式
-            char_format = QTextCharFormat()
-            char_format.setBackground(QColor("white"))  # 恢复背景为白色
-            char_format.setForeground(QColor("black"))  # 恢复字体颜色为黑色
-            cursor.setCharFormat(char_format)
-            
-            # 这一句是什么作用？
-            self.gcode_display.setTextCursor(cursor)
-        else: # 如果这是第一行，则不执行恢复操作
-            return
-    
     @Slot(int)
     def update_file_position(self, file_position):
         
@@ -1,84 +1,85 @@
-from pathlib import Path
-
 from PySide6.QtWidgets import (
      QWidget, QVBoxLayout, QHBoxLayout, QSizePolicy, QPushButton, QStyle
 )
 from PySide6.QtCore import QSize, Signal, Slot, QTimer
-from PySide6.QtGui import QIcon
 from .command_widget import CommandWidget
 from .data_plot_widget import DataPlotWidget
 from .platform_status_widget import PlatformStatusWidget
 from .vision_widget import VisionWidget
 from .klipper_status_widget import KlipperStatusWidget
+from .icon_cache import ICON_DIR, file_icon, standard_icon
 import logging
 
+_BUTTON_SIZE = 80
+
+# 播放/暂停圆形按钮的 QSS 样式表，模块加载时格式化一次，所有 HomeWidget 共用
+_PLAY_PAUSE_QSS = f"""
+    QPushButton {{
+        /* 关键: border-radius 必须是 宽/高 的一半 */
+        border-radius: {_BUTTON_SIZE // 2}px; 
+        
+        /* (可选) 添加边框 */
+        border: 2px solid #aaaaaa; 
+        
+        /* (可选) 默认背景色 */
+        background-color: #f0f0f0;
+
+        font-size: 24pt;
+    }}
+    
+    /* (可选) 鼠标悬停时的样式 */
+    QPushButton:hover {{
+        background-color: #e0e0e0;
+    }}
+
+    /* (可选) 鼠标按下时的样式 */
+    QPushButton:pressed {{
+        background-color: #d0d0d0;
+    }}
+
+    /* (可选) 选中状态 (checked) 时的样式 */
+    QPushButton:checked {{
+        background-color: #cce5ff; /* 浅蓝色 */
+        border: 2px solid #0078d7; /* 蓝色边框 */
+    }}
+"""
+_STOP_BUTTON_QSS = "QPushButton { border: none; padding: 0; background: transparent; }"
+
+
 class HomeWidget(QWidget):
     """主页控件，包含 G-code 控件和数据状态监视控件"""
 
     sigExtrude = Signal(str)
     sigRetract = Signal(str)
 
-    def __init__(self, time_window_s=60):
+    def __init__(self, time_window_s=60, max_points=10000):
         super().__init__()
 
         self.logger = logging.getLogger(__name__)
         self.command_widget = CommandWidget()
         self.command_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.data_widget = DataPlotWidget(time_window_s=time_window_s)
+        self.data_widget = DataPlotWidget(time_window_s=time_window_s, max_points=max_points)
         self.status_widget = PlatformStatusWidget()
         self.dieswell_widget = VisionWidget() # hik cam roi
         self.ir_roi_widget = VisionWidget()
 
         # play / pause button, emergency stop button, restart button
-        style = self.style()
-        self.play_icon = style.standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
-        self.pause_icon = style.standardIcon(QStyle.StandardPixmap.SP_MediaPause)
+        self.play_icon = standard_icon(QStyle.StandardPixmap.SP_MediaPlay)
+        self.pause_icon = standard_icon(QStyle.StandardPixmap.SP_MediaPause)
         self.play_pause_button = QPushButton()
         self.play_pause_button.setCheckable(True)
         self.play_pause_button.setIcon(self.play_icon)
-        button_size = 80
+        button_size = _BUTTON_SIZE
         self.play_pause_button.setFixedSize(button_size, button_size)
         self.play_pause_button.setIconSize(QSize(button_size // 2, button_size // 2))
-        # 定义 QSS 样式表
-        qss_style = f"""
-        QPushButton {{
-            /* 关键: border-radius 必须是 宽/高 的一半 */
-            border-radius: {button_size // 2}px; 
-            
-            /* (可选) 添加边框 */
-            border: 2px solid #aaaaaa; 
-            
-            /* (可选) 默认背景色 */
-            background-color: #f0f0f0;
-
-            font-size: 24pt;
-        }}
-        
-        /* (可选) 鼠标悬停时的样式 */
-        QPushButton:hover {{
-            background-color: #e0e0e0;
-        }}
-
-        /* (可选) 鼠标按下时的样式 */
-        QPushButton:pressed {{
-            background-color: #d0d0d0;
-        }}
-
-        /* (可选) 选中状态 (checked) 时的样式 */
-        QPushButton:checked {{
-            background-color: #cce5ff; /* 浅蓝色 */
-            border: 2px solid #0078d7; /* 蓝色边框 */
-        }}
-        """
-        self.play_pause_button.setStyleSheet(qss_style)
+        self.play_pause_button.setStyleSheet(_PLAY_PAUSE_QSS)
 
         self.stop_button = QPushButton()
-        _icon_dir = Path(__file__).resolve().parent / "icons"
-        self.stop_icon = QIcon(str(_icon_dir / "emergency_stop.png"))
+        self.stop_icon = file_icon(str(ICON_DIR / "emergency_stop.png"))
         self.stop_button.setIcon(self.stop_icon)
         self.stop_button.setFixedSize(button_size, button_size)
         self.stop_button.setIconSize(QSize(button_size, button_size))
-        self.stop_button.setStyleSheet("QPushButton { border: none; padding: 0; background: transparent; }")
+        self.stop_button.setStyleSheet(_STOP_BUTTON_QSS)
 
 
         # extrude, retract buttons (按住连续挤出/回抽，松开立即停止)
@@ -0,0 +1,19 @@
+from functools import cache
+from pathlib import Path
+
+from PySide6.QtGui import QIcon
+from PySide6.QtWidgets import QApplication, QStyle
+
+ICON_DIR = Path(__file__).resolve().parent / "icons"
+
+
+@cache
+def standard_icon(pixmap: QStyle.StandardPixmap) -> QIcon:
+    """标准图标只向 style 查询一次，所有控件实例共用（需在 QApplication 创建之后调用）"""
+    return QApplication.style().standardIcon(pixmap)
+
+
+@cache
+def file_icon(path: str) -> QIcon:
+    """图标文件只从磁盘加载一次，所有控件实例共用"""
+    return QIcon(path)
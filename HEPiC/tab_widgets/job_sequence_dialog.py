@@ -1,6 +1,6 @@
 import sys
 from PySide6.QtWidgets import (QApplication, QMainWindow, QPushButton, QDialog, 
-                               QHBoxLayout, QVBoxLayout, QFormLayout, QLineEdit, QSpinBox, 
+                               QHBoxLayout, QVBoxLayout, QFormLayout, QSpinBox, QDoubleSpinBox, 
                                QDialogButtonBox, QMessageBox, QWidget)
 import numpy as np
 
@@ -16,20 +16,20 @@ class JobSequenceDialog(QDialog):
 
         form_layout = QFormLayout()
 
-        # 2. 创建输入控件
-        self.vmin_input = QLineEdit()
-        self.vmax_input = QLineEdit()
+        # 2. 创建输入控件（数值框直接保存 double，输入即校验，读取时无需再从文本解析）
+        self.vmin_input = self._double_input(0, 100, 2, " mm/s")
+        self.vmax_input = self._double_input(0, 100, 2, " mm/s")
         self.vnum_input = QSpinBox()
         self.vnum_input.setRange(0, 100)
         self.vnum_input.setValue(20)
 
-        self.tmin_input = QLineEdit()
-        self.tmax_input = QLineEdit()
+        self.tmin_input = self._double_input(0, 500, 1, " ℃")
+        self.tmax_input = self._double_input(0, 500, 1, " ℃")
         self.tnum_input = QSpinBox()
         self.tnum_input.setRange(0, 100)
         self.tnum_input.setValue(20)
 
-        self.tstep_input = QLineEdit()
+        self.tstep_input = self._double_input(0, 3600, 1, " s")
 
         # 3. 将控件添加到表单布局
         form_layout.addRow("最小速度:", self.vmin_input)
@@ -54,6 +54,14 @@ class JobSequenceDialog(QDialog):
         layout.addWidget(self.buttons)
         self.setLayout(layout)
 
+    @staticmethod
+    def _double_input(minimum, maximum, decimals, suffix):
+        box = QDoubleSpinBox()
+        box.setRange(minimum, maximum)
+        box.setDecimals(decimals)
+        box.setSuffix(suffix)
+        return box
+
     def get_job_sequence(self):
         """返回用户输入的数据"""
 
@@ -63,10 +71,17 @@ class JobSequenceDialog(QDialog):
             "M118 STATUS 正在加热"
         ]
 
-        Ts = np.linspace(float(self.tmin_input.text()), float(self.tmax_input.text()), self.tnum_input.value())
-        Vs = np.linspace(float(self.vmin_input.text()), float(self.vmax_input.text()), self.vnum_input.value())
-        t_each = float(self.tstep_input.text())
-            
+        Ts = np.linspace(self.tmin_input.value(), self.tmax_input.value(), self.tnum_input.value())
+        Vs = np.linspace(self.vmin_input.value(), self.vmax_input.value(), self.vnum_input.value())
+        t_each = self.tstep_input.value()
+
+        # 每个温度下的速度扫描段完全相同：只格式化一次，之后按温度整段复用
+        velocity_block = [
+            line
+            for V, ext_length, feedrate in zip(Vs.tolist(), (Vs * t_each).tolist(), (Vs * 60).tolist())
+            for line in (f"M118 STATUS V = {V:.2f} mm/s", f"G1 E{ext_length:.2f} F{feedrate:.2f}", "M400")
+        ]
+
         for num, T in enumerate(Ts):
             job_sequence_list.append(f"M109 S{T:.2f}")
             if num == 0:
@@ -93,12 +108,8 @@ class JobSequenceDialog(QDialog):
                     "M118 STATUS 测试开始!",
                     "M118 START_RECORDING"
                 ])
-            for V in Vs:
-                job_sequence_list.append(f"M118 STATUS V = {V:.2f} mm/s")
-                ext_length = V*t_each
-                job_sequence_list.append(f"G1 E{ext_length:.2f} F{V*60:.2f}")
-                job_sequence_list.append("M400")
-                
+            job_sequence_list.extend(velocity_block)
+
         job_sequence_list.append("M118 STATUS 测试结束!")
         job_sequence_list.append("M118 STOP_RECORDING")
         job_sequence_list.append("FIRMWARE_RESTART\n")
@@ -7,9 +7,19 @@ import pyqtgraph as pg
 import logging
 from ..utils.gcode_parser import parse_gcode_time_series
 
+# 预览曲线：(数据项, 颜色, 标题 HTML)，标题在模块加载时格式化一次
+_TITLE_FMT = "<span style='color: %s; font-size: 10pt; font-weight: normal; font-family: Microsoft YaHei UI'>%s</span>"
+_PLOT_SPECS = [
+    (item, color, _TITLE_FMT % (color, title))
+    for item, color, title in (
+        ("filament_velocity_mms", "#2980b9", "进线速度(mm/s)"),
+        ("hotend_temperature_C", "#e74c3c", "温度(℃)"),
+    )
+]
+
 class JobSequenceWidget(QWidget):
 
-    def __init__(self, line_width=2):
+    def __init__(self, line_width=2, parse_cache_size=8):
 
         super().__init__()
 
@@ -19,17 +29,16 @@ class JobSequenceWidget(QWidget):
         self.gcode_widget = GcodeWidget()
 
         # 创建 pyqtgraph widgets
-        items = ["filament_velocity_mms", "hotend_temperature_C"]
-        colors = ['#2980b9', '#e74c3c']
-        titles = ["进线速度(mm/s)", "温度(℃)"]
-        
         self.plots = {}
         self.curves = {}
-        title_size = 10
 
-        for item, color, title in zip(items, colors, titles):
-            self.plots[item] = pg.PlotWidget(title=f"<span style='color: {color}; font-size: {title_size}pt; font-weight: normal; font-family: Microsoft YaHei UI'>{title}</span>")
-            self.curves[item] = self.plots[item].plot(pen=pg.mkPen(color, width=line_width))
+        for item, color, title_html in _PLOT_SPECS:
+            self.plots[item] = pg.PlotWidget(title=title_html)
+            curve = self.plots[item].plot(pen=pg.mkPen(color, width=line_width))
+            # long programs: only draw what is visible, and at most ~one peak pair per pixel column
+            curve.setClipToView(True)
+            curve.setDownsampling(auto=True, method="peak")
+            self.curves[item] = curve
 
         # 布局
         layout = QHBoxLayout()
@@ -38,8 +47,8 @@ class JobSequenceWidget(QWidget):
 
         plot_layout = QVBoxLayout()
 
-        for item in items:
-            plot_layout.addWidget(self.plots[item])
+        for plot in self.plots.values():
+            plot_layout.addWidget(plot)
 
         layout.addLayout(plot_layout)
 
@@ -48,11 +57,21 @@ class JobSequenceWidget(QWidget):
         # signal - slots
         self.gcode_widget.sigGcode.connect(self.show_plots)
 
+        # 最近解析过的 G-code -> (t, ve, temp)，重新打开/生成相同的序列时不必再解析一遍
+        self._parse_cache: dict[str, tuple] = {}
+        self._parse_cache_size = parse_cache_size
+
         
 
-    @Slot(str)
+    @Slot(object)
     def show_plots(self, gcode):
-        t, ve, temp = parse_gcode_time_series(gcode)
+        cached = self._parse_cache.pop(gcode, None)
+        if cached is None:
+            cached = parse_gcode_time_series(gcode)
+            if len(self._parse_cache) >= self._parse_cache_size:
+                self._parse_cache.pop(next(iter(self._parse_cache))) # 丢弃最久未用的
+        self._parse_cache[gcode] = cached # 重新插入到末尾，标记为最近使用
+        t, ve, temp = cached
         self.curves["filament_velocity_mms"].setData(t, ve)
         self.curves["hotend_temperature_C"].setData(t, temp)
 
@@ -2,30 +2,50 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout,
     QPlainTextEdit, QLabel, QLabel
 )
-from PySide6.QtCore import Slot
-from datetime import datetime
+from PySide6.QtCore import QTimer, Slot
+from collections import deque
+from .minute_clock import MinuteClock
 
 class LogWidget(QWidget):
 
-    def __init__(self):
+    def __init__(self, flush_interval_ms=16, max_block_count=2000):
 
         super().__init__()
 
         self.log_display = QPlainTextEdit()
         self.log_display.setReadOnly(True)
         self.log_display.setPlaceholderText("这里会显示原始数据和调试信息...")
+        # 最多保留 max_block_count 行（0 表示不限制），内存不随运行时间增长；只读显示不需要撤销栈
+        self.log_display.setMaximumBlockCount(max_block_count)
+        self.log_display.setUndoRedoEnabled(False)
 
         layout = QVBoxLayout()
         layout.addWidget(self.log_display) # 占据多行多列
         self.setLayout(layout)
 
+        # 消息先进缓冲区，由单次定时器合并成一次追加（约一帧一次），避免连续消息逐条排版重绘
+        self._pending = deque(maxlen=max_block_count or None)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self._clock = MinuteClock()
+
     @Slot(str)
     def update_log(self, message):
         # time stamp
-        now = datetime.now()
-        time_str = now.strftime("%H:%M")
+        time_str = self._clock.now()
+
+        self._pending.append(f"{time_str}  {message}")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
 
-        self.log_display.appendPlainText(f"{time_str}  {message}")
+    @Slot()
+    def _flush(self):
+        if self._pending:
+            self.log_display.appendPlainText("\n".join(self._pending))
+            self._pending.clear()
 
 
 if __name__ == "__main__":
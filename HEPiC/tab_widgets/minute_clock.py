@@ -0,0 +1,16 @@
+import time
+
+
+class MinuteClock:
+    """日志 / 指令窗口共用的 "HH:MM" 时间戳：时间戳只精确到分钟，同一分钟内复用已格式化的字符串"""
+
+    def __init__(self):
+        self._last_minute = None
+        self._last_time_str = ""
+
+    def now(self) -> str:
+        now = int(time.time())
+        if now // 60 != self._last_minute:
+            self._last_minute = now // 60
+            self._last_time_str = time.strftime("%H:%M", time.localtime(now))
+        return self._last_time_str
@@ -3,7 +3,6 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 from PySide6.QtCore import Signal, Slot
-from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -14,6 +13,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from .icon_cache import file_icon
+
 
 class PlatformStatusWidget(QWidget):
     set_temperature = Signal(float)
@@ -24,7 +25,7 @@ class PlatformStatusWidget(QWidget):
 
         current_file_path = Path(__file__).resolve()
         icon_path = current_file_path.parent / icon_path
-        self.zero_icon = QIcon(str(icon_path / "toZero.png"))
+        self.zero_icon = file_icon(str(icon_path / "toZero.png"))
         self.placeholder = placeholder
         self._print_start_time: float | None = None
         self._status_text = ""
@@ -53,6 +54,15 @@ class PlatformStatusWidget(QWidget):
 
         self.tcp_sensor_widgets: dict[str, dict] = {}
 
+        # 固定字段的刷新表：(data 中的键, 显示控件, 格式串)，update_display 按表逐项刷新
+        self._status_fields = (
+            ("measured_temperature_C", self.hotend_temperature_value, "%5.1f /"),
+            ("measured_feedrate_mms", self.measured_feedrate_value, "%5.1f /"),
+            ("feedrate_mms", self.feedrate_value, "%5.1f mm/s"),
+            ("die_temperature_C", self.die_temperature_value, "%5.1f ℃"),
+            ("die_diameter_px", self.die_diameter_value, "%5.1f px"),
+        )
+
         layout = QVBoxLayout()
         self.main_layout = layout
 
@@ -144,39 +154,28 @@ class PlatformStatusWidget(QWidget):
                 "button": zero_button,
             }
 
-    @Slot(dict)
+    @Slot(object)
     def update_display(self, data):
         for sensor_name, row in self.tcp_sensor_widgets.items():
             value = data.get(sensor_name, None)
             if value is None:
                 continue
             try:
-                row["value"].setText(f"{float(value):5.1f}")
+                row["value"].setText("%5.1f" % value)
             except Exception:
                 row["value"].setText(str(value))
 
-        if "measured_temperature_C" in data:
-            temperature = data["measured_temperature_C"]
-            self.hotend_temperature_value.setText(f"{temperature:5.1f} /")
-
-        if "measured_feedrate_mms" in data:
-            measured_feedrate = data["measured_feedrate_mms"]
-            self.measured_feedrate_value.setText(f"{measured_feedrate:5.1f} /")
-
-        if "feedrate_mms" in data:
-            feedrate = data["feedrate_mms"]
-            self.feedrate_value.setText(f"{feedrate:5.1f} mm/s")
-
-        if "die_temperature_C" in data:
-            die_temperature = data["die_temperature_C"]
-            self.die_temperature_value.setText(f"{die_temperature:5.1f} ℃")
-
-        if "die_diameter_px" in data:
-            die_diameter = data["die_diameter_px"]
-            self.die_diameter_value.setText(f"{die_diameter:5.1f} px")
+        for key, label, fmt in self._status_fields:
+            value = data.get(key)
+            if value is not None:
+                label.setText(fmt % value)
 
     def on_temp_enter_pressed(self):
-        self.set_temperature.emit(float(self.hotend_temperature_input.text()))
+        try:
+            target = float(self.hotend_temperature_input.text())
+        except ValueError: # 非数字输入直接忽略
+            return
+        self.set_temperature.emit(target)
 
     @Slot(float)
     def update_progress(self, progress):
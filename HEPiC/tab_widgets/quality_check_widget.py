@@ -555,18 +555,16 @@ class QualityCheckWidget(QWidget):
     def on_data_update_timeout(self):
         pass
 
-    @Slot(dict)
-    def update_sensor_data(self, data: dict):
+    @Slot(list, object)
+    def update_sensor_data(self, columns, rows):
         if not self.is_checking:
             return
 
-        time_data = data.get("time_s", [])
-        force_data = data.get("extrusion_force_N", [])
-        if not time_data or not force_data:
+        if not len(rows) or "time_s" not in columns or "extrusion_force_N" not in columns:
             return
 
-        latest_time = time_data[-1]
-        latest_force = force_data[-1]
+        latest_time = rows[-1, columns.index("time_s")]
+        latest_force = rows[-1, columns.index("extrusion_force_N")]
         self.time_cache.append(latest_time)
         self.extrusion_force_cache.append(latest_force)
 
@@ -578,7 +576,7 @@ class QualityCheckWidget(QWidget):
         self.update_plot()
         self.update_stability_indicator()
 
-    @Slot(dict)
+    @Slot(object)
     def update_klipper_status(self, data: dict):
         temperature = data.get("measured_temperature_C", np.nan)
         feedrate = data.get("feedrate_mms", np.nan)
@@ -63,11 +63,17 @@ class VisionPageWidget(QWidget):
         self.calibration_button.pressed.connect(self.on_calibration_pressed)
 
     def on_exp_time_pressed(self):
-        exp_time = float(self.exp_time.text())
+        try:
+            exp_time = float(self.exp_time.text())
+        except ValueError: # 非数字输入直接忽略
+            return
         self.sigExpTime.emit(exp_time)
 
     def on_fps_pressed(self):
-        fps = float(self.fps.text())
+        try:
+            fps = float(self.fps.text())
+        except ValueError:
+            return
         self.sigFPS.emit(fps)
     
     def on_calibration_pressed(self):
@@ -90,24 +96,28 @@ class ImageGenerator(QObject):
 
     def __init__(self):
         super().__init__()
+        # 相位之外的部分每帧都一样：只算一次，用 float32 减半内存带宽
+        X, Y = np.meshgrid(np.linspace(0, 4*np.pi, 512), np.linspace(0, 4*np.pi, 512))
+        self._base = (0.01*X + 0.1*Y).astype(np.float32)
 
-    def generate(self):
-
-        import time
+    async def generate(self, interval_s=.05):
+        """在 GUI 线程的 asyncio 事件循环里运行，信号直接调用槽函数，不经过跨线程排队"""
 
-        X, Y = np.meshgrid(np.linspace(0, 4*np.pi, 512), np.linspace(0, 4*np.pi, 512))
+        import asyncio
 
         offset = 0
         while True:
-            img = np.sin(0.01*X+0.1*Y+offset)
+            img = self._base + np.float32(offset)
+            np.sin(img, out=img) # 原地求 sin，每帧只分配一张新图（接收方可能仍持有上一张）
             self.sigImage.emit(img)
             offset += .1
-            time.sleep(.05)
+            await asyncio.sleep(interval_s)
 
 if __name__ == "__main__":
     import sys
+    import asyncio
     from PySide6.QtWidgets import QApplication
-    from threading import Thread
+    from qasync import QEventLoop
     from ..vision import ProcessingWorker
 
     logging.basicConfig(
@@ -119,13 +129,14 @@ if __name__ == "__main__":
     logging.getLogger("vision_widget").setLevel(logging.DEBUG)
     logging.getLogger("vision.video_worker").setLevel(logging.DEBUG)
     app = QApplication(sys.argv)
+    loop = QEventLoop(app)
+    asyncio.set_event_loop(loop)
     widget = VisionPageWidget()
 
     # display synthesized images
     ig = ImageGenerator()
     ig.sigImage.connect(widget.vision_widget.update_live_display)
-    thread = Thread(target=ig.generate)
-    thread.start()
+    generator_task = loop.create_task(ig.generate())
     
     processing_worker = ProcessingWorker()
     widget.vision_widget.sigRoiImage.connect(processing_worker.process_frame)
@@ -133,5 +144,6 @@ if __name__ == "__main__":
     
     widget.show()
 
-    sys.exit(app.exec())
+    with loop:
+        loop.run_forever()
     
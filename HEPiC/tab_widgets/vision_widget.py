@@ -1,7 +1,9 @@
 import pyqtgraph as pg
 import numpy as np
-from PySide6.QtCore import Signal, Slot, QPointF, QLineF
+from PySide6.QtCore import Signal, Slot, QPointF, QLineF, QTimer
 import logging
+import time
+import warnings
 from PySide6 import QtWidgets, QtCore
 
 class VisionWidget(pg.GraphicsLayoutWidget):
@@ -9,7 +11,7 @@ class VisionWidget(pg.GraphicsLayoutWidget):
     sigRoiChanged = Signal(tuple) # 发射 (x, y, w, h)
     sigRoiImage = Signal(np.ndarray)
 
-    def __init__(self):
+    def __init__(self, min_redraw_interval_ms=16, levels_refresh_s=1.0):
 
         super().__init__()
 
@@ -42,21 +44,44 @@ class VisionWidget(pg.GraphicsLayoutWidget):
         self.plot_item.hideAxis('left')
         self.plot_item.hideAxis('bottom')
         
-        # 5. 创建 ImageItem 并将其添加到 PlotItem 中
-        self.img_item = pg.ImageItem()
+        # 5. 创建 ImageItem 并将其添加到 PlotItem 中（轴顺序在创建时设定一次，不必每帧传入）
+        self.img_item = pg.ImageItem(axisOrder="row-major")
         self.plot_item.addItem(self.img_item)
 
         # logger
         self.logger = logging.getLogger(__name__)
         self.frame = None
 
+        # 帧率高于屏幕刷新率时，多余的帧只更新 self.frame，最多每 min_redraw_interval_ms 上传一次图像
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(min_redraw_interval_ms)
+        self._redraw_timer.timeout.connect(self._on_redraw_timer)
+        self._redraw_pending = False
+
+        # 显示范围 (levels) 由 ImageItem 缓存，只在帧的 dtype/形状变化或每 levels_refresh_s 秒重新统计一次，
+        # 其余帧直接沿用，省去每帧一次整幅图的 min/max
+        self.levels_refresh_s = levels_refresh_s
+        self._levels_key = None
+        self._levels_time = 0.0
+        self._ubyte_range = None
+        self._f32_scratch = None
+        self._u8_scratch = None
+
         # modes, can be "roi", "measure", "view"
         self.mode = "view"
 
     @Slot(np.ndarray)
     def update_live_display(self, frame):
         self.frame = frame
-        self.img_item.setImage(frame, axisOrder="row-major")
+        # 同一帧常同时送到不同标签页上的几个控件：只为看得见的控件转换和上传图像，
+        # 隐藏的控件在 showEvent 里补上最新一帧
+        if self.isVisible():
+            if self._redraw_timer.isActive():
+                self._redraw_pending = True
+            else:
+                self._redraw()
+                self._redraw_timer.start()
         if hasattr(self, "roi_info"):
             x0, y0, w, h = self.roi_info
             roi_image = frame[x0:x0+w, y0:y0+h]
@@ -64,6 +89,66 @@ class VisionWidget(pg.GraphicsLayoutWidget):
         else:
             self.sigRoiImage.emit(frame)
          
+    @Slot()
+    def _on_redraw_timer(self):
+        if self._redraw_pending:
+            self._redraw_pending = False
+            self._redraw()
+            self._redraw_timer.start()
+
+    def _redraw(self):
+        """把最新一帧交给 ImageItem，中间被跳过的帧不再显示。"""
+        frame = self.frame
+        if frame is None:
+            return
+        now = time.monotonic()
+        key = (frame.dtype, frame.shape)
+        refresh = key != self._levels_key or now - self._levels_time >= self.levels_refresh_s
+        if refresh:
+            self._levels_key = key
+            self._levels_time = now
+        if frame.dtype == np.uint8:
+            self.img_item.setImage(frame, autoLevels=refresh)
+        else:
+            # 浮点/布尔等帧先按缓存的范围量化为 uint8，ImageItem 走 ubyte 快速路径，不再逐帧 rescale
+            self.img_item.setImage(self._to_ubyte(frame, refresh), levels=(0, 255))
+
+    def _to_ubyte(self, frame, refresh):
+        """把非 uint8 帧线性映射到 0-255，写入预先分配的缓冲区。
+
+        映射范围只在 refresh 为 True 时由 frame 的 min/max 重新统计。
+        """
+        if self._u8_scratch is None or self._u8_scratch.shape != frame.shape:
+            self._f32_scratch = np.empty(frame.shape, np.float32)
+            self._u8_scratch = np.empty(frame.shape, np.uint8)
+            refresh = True
+        if refresh or self._ubyte_range is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)  # 全 nan 帧
+                lo, hi = float(np.nanmin(frame)), float(np.nanmax(frame))
+            if not np.isfinite(lo):  # 全 nan 帧
+                lo = 0.0
+            if not hi > lo:  # 纯色帧
+                hi = lo + 1.0
+            self._ubyte_range = (lo, hi)
+        lo, hi = self._ubyte_range
+        buf = self._f32_scratch
+        np.subtract(frame, lo, out=buf, casting="unsafe")
+        np.multiply(buf, 255.0 / (hi - lo), out=buf)
+        np.clip(buf, 0, 255, out=buf)
+        np.nan_to_num(buf, copy=False)
+        np.copyto(self._u8_scratch, buf, casting="unsafe")
+        return self._u8_scratch
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._redraw()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._redraw_timer.stop()
+        self._redraw_pending = False
+
     def mousePressEvent(self, event):
         # pyqtgraph 内部会处理好 PyQt/PySide 的差异，所以这部分逻辑不变
         if self.mode == "view":
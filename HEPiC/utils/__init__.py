@@ -1,2 +1,4 @@
 from .gcode_parser import parse_gcode_time_series
-from .gcode_position_mapper import GcodePositionMapper
\ No newline at end of file
+from .gcode_position_mapper import GcodePositionMapper
+from .ring_buffer import RingBuffer
+from .autosave import open_autosave_writer, read_autosave, arrow_to_csv
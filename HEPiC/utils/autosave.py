@@ -0,0 +1,149 @@
+"""
+autosave.py
+===========
+Row writers used by MainWindow to stream recorded data to disk.
+
+Both writers collect rows into fixed-size float64 chunks and write a whole
+chunk at once. CSV is the default format. When `pyarrow` is installed, the
+Arrow IPC stream format (`.arrows`) can be selected with the
+`autosave_format` config key: chunks are written as binary record batches,
+which avoids float-to-text encoding altogether. The stream format has no
+footer, so a file cut short by a crash is still readable up to the last
+complete batch.
+"""
+
+from abc import ABC, abstractmethod
+import csv
+import logging
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkedAutosaveWriter(ABC):
+    """Collect rows into a float64 chunk and hand each full chunk to `_write_chunk`."""
+
+    suffix = ""
+
+    def __init__(self, path: Path, columns, chunk_rows: int = 100):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self._chunk = np.full((max(int(chunk_rows), 1), len(self.columns)), np.nan)
+        self._n = 0
+
+    def write_row(self, row):
+        self._chunk[self._n] = row
+        self._n += 1
+        if self._n == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        if not self._n:
+            return
+        self._write_chunk(self._chunk[: self._n])
+        self._n = 0
+
+    @abstractmethod
+    def _write_chunk(self, rows: np.ndarray):
+        """Write the given rows to `self.path`."""
+
+
+class CsvAutosaveWriter(_ChunkedAutosaveWriter):
+    """Write each full chunk as CSV lines in one `np.savetxt` call, after a header line of column names."""
+
+    suffix = ".csv"
+
+    def __init__(self, path: Path, columns, chunk_rows: int = 100, float_format: str = "%.10g"):
+        super().__init__(path, columns, chunk_rows)
+        self.float_format = float_format
+        self._file = open(self.path, "w", buffering=1 << 16, newline="", encoding="utf-8")
+        csv.writer(self._file).writerow(self.columns)
+
+    def _write_chunk(self, rows: np.ndarray):
+        np.savetxt(self._file, rows, fmt=self.float_format, delimiter=",")
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+class ArrowAutosaveWriter(_ChunkedAutosaveWriter):
+    """Write each full chunk as one Arrow record batch."""
+
+    suffix = ".arrows"
+
+    def __init__(self, path: Path, columns, chunk_rows: int = 100):
+        super().__init__(path, columns, chunk_rows)
+        self._schema = pa.schema([(name, pa.float64()) for name in self.columns])
+        self._sink = pa.OSFile(str(self.path), "wb")
+        self._writer = pa.ipc.new_stream(self._sink, self._schema)
+
+    def _write_chunk(self, rows: np.ndarray):
+        batch = pa.record_batch(
+            [pa.array(rows[:, i]) for i in range(len(self.columns))],
+            schema=self._schema,
+        )
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._sink.close()
+        self._writer = None
+
+
+def open_autosave_writer(path_stem: Path, columns, fmt: str = "csv", chunk_rows: int = 100):
+    """Open an autosave writer at `path_stem` plus the suffix of the chosen format.
+
+    Parameters
+    ----------
+    path_stem : Path
+        Output path without suffix.
+    columns : list[str]
+        Column names, in the order rows will be written.
+    fmt : str
+        "csv" or "arrow". "arrow" falls back to CSV if pyarrow is not installed.
+    chunk_rows : int
+        Rows collected before each write to disk.
+    """
+    path_stem = Path(path_stem)
+    if fmt == "arrow":
+        if PYARROW_AVAILABLE:
+            return ArrowAutosaveWriter(path_stem.with_name(path_stem.name + ArrowAutosaveWriter.suffix), columns, chunk_rows)
+        logger.warning("pyarrow is not installed, autosave falls back to CSV.")
+    return CsvAutosaveWriter(path_stem.with_name(path_stem.name + CsvAutosaveWriter.suffix), columns, chunk_rows)
+
+
+def read_autosave(path):
+    """Load an autosave file (.csv or .arrows) into a pandas DataFrame."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix == ArrowAutosaveWriter.suffix:
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Reading .arrows autosave files requires pyarrow.")
+        with pa.OSFile(str(path), "rb") as source:
+            return pa.ipc.open_stream(source).read_pandas()
+    return pd.read_csv(path)
+
+
+def arrow_to_csv(arrow_path, csv_path=None) -> Path:
+    """Convert an .arrows autosave file to CSV for tools that only read text. Returns the CSV path."""
+    arrow_path = Path(arrow_path)
+    csv_path = Path(csv_path) if csv_path else arrow_path.with_suffix(".csv")
+    read_autosave(arrow_path).to_csv(csv_path, index=False)
+    return csv_path
@@ -1,6 +1,7 @@
 import time
 import bisect
 import logging
+from itertools import accumulate
 
 class GcodePositionMapper:
     """
@@ -8,7 +9,7 @@ class GcodePositionMapper:
     高效地映射回 G-code 文件的行号。
     """
     
-    def __init__(self, gcode_content: str):
+    def __init__(self, gcode_content: str | bytes):
         
         self.logger = logging.getLogger(__name__)
         self.logger.info("正在构建 G-code 字节偏移量映射表...")
@@ -23,22 +24,19 @@ class GcodePositionMapper:
 
     def _build_map(self):
         """
-        遍历 G-code 字符串，填充 line_start_offsets 列表。
+        按行累加 *字节* 长度，填充 line_start_offsets 列表。
         必须按“字节”计算，而不是“字符”。
         """
-        current_byte_offset = 0
-        
-        # 我们按行分割字符串，保留换行符
-        for line in self.gcode_content.splitlines(True):
-            # 将此行的起始字节偏移量添加到列表中
-            self.line_start_offsets.append(current_byte_offset)
-            
-            # 计算此行（包括 \n）的 *字节* 长度，并累加
-            # Klipper (Python 3) 默认使用 UTF-8
-            current_byte_offset += len(line.encode('utf-8'))
-        
-        self.total_lines = len(self.line_start_offsets)
-        self.total_bytes = current_byte_offset
+        data = self.gcode_content
+        if isinstance(data, str):
+            # Klipper (Python 3) 默认使用 UTF-8；整段编码一次，而不是逐行 encode
+            data = data.encode("utf-8")
+
+        # 按行分割（保留换行符），累加得到每一行的起始字节偏移量，最后一项即总字节数
+        offsets = list(accumulate(map(len, data.splitlines(True)), initial=0))
+        self.total_bytes = offsets.pop()
+        self.line_start_offsets = offsets
+        self.total_lines = len(offsets)
 
     def get_line_number(self, target_byte_position: int) -> int:
         """
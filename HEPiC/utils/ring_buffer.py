@@ -0,0 +1,180 @@
+import threading
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    A column-oriented numeric ring buffer backed by a single 2D NumPy array.
+
+    Each row is one sample and each column one data item (``time_s``,
+    ``temperature_C`` ...). Appending a row is a single vectorized assignment
+    instead of one ``deque.append`` per item. Storage grows geometrically up
+    to ``capacity`` rows, after which the oldest rows are overwritten, so a
+    large capacity does not cost memory until it is actually used.
+
+    Appends and reads are guarded by a lock: rows are written by the data
+    collector thread and read by the GUI thread.
+    """
+
+    _INITIAL_ROWS = 4096
+
+    def __init__(self, columns, capacity: int, dtype=np.float64):
+        self.columns: list[str] = list(columns)
+        self.capacity = max(int(capacity), 1)
+        self.dtype = np.dtype(dtype)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._buf = np.full(
+            (min(self._INITIAL_ROWS, self.capacity), len(self.columns)),
+            np.nan,
+            dtype=self.dtype,
+        )
+        self._write_idx = 0  # total number of rows ever appended
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._write_idx, self.capacity)
+
+    def __contains__(self, name) -> bool:
+        return name in self._index
+
+    @property
+    def total(self) -> int:
+        """Total number of rows appended since creation (not capped by capacity)."""
+        return self._write_idx
+
+    def column_index(self, name: str) -> int:
+        return self._index[name]
+
+    def add_columns(self, names) -> bool:
+        """Append new columns, back-filled with nan. Returns True if any column was added."""
+        new = [name for name in names if name not in self._index]
+        if not new:
+            return False
+        with self._lock:
+            pad = np.full((self._buf.shape[0], len(new)), np.nan, dtype=self.dtype)
+            self._buf = np.hstack([self._buf, pad])
+            base = len(self.columns)
+            for offset, name in enumerate(new):
+                self._index[name] = base + offset
+            # Rebind rather than mutate so a row being built from an older
+            # snapshot of `columns` on another thread stays self-consistent.
+            self.columns = self.columns + new
+        return True
+
+    def append(self, row) -> None:
+        """
+        Append one row whose values are ordered like ``self.columns``.
+
+        A row shorter than the current width (built before ``add_columns``)
+        is padded with nan.
+        """
+        with self._lock:
+            rows = self._buf.shape[0]
+            if self._write_idx >= rows and rows < self.capacity:
+                self._grow()
+                rows = self._buf.shape[0]
+            target = self._buf[self._write_idx % rows]
+            n = len(row)
+            target[:n] = row
+            if n < target.size:
+                target[n:] = np.nan
+            self._write_idx += 1
+
+    def extend(self, rows) -> None:
+        """Append a 2D block of rows in one go. Rows narrower than the current width are padded with nan."""
+        rows = np.asarray(rows, dtype=self.dtype)
+        n = len(rows)
+        if n == 0:
+            return
+        with self._lock:
+            if n > self.capacity:
+                self._write_idx += n - self.capacity
+                rows = rows[-self.capacity:]
+                n = self.capacity
+            while self._write_idx + n > self._buf.shape[0] and self._buf.shape[0] < self.capacity:
+                self._grow()
+            size = self._buf.shape[0]
+            width = rows.shape[1]
+            pos = self._write_idx % size
+            first = min(n, size - pos)
+            self._buf[pos:pos + first, :width] = rows[:first]
+            self._buf[pos:pos + first, width:] = np.nan
+            if first < n:
+                self._buf[:n - first, :width] = rows[first:]
+                self._buf[:n - first, width:] = np.nan
+            self._write_idx += n
+
+    def rows_since(self, cursor: int):
+        """
+        Return the rows appended after ``cursor`` (a previous ``total``).
+
+        Returns
+        -------
+        columns : list[str]
+            Column names matching the width of ``rows``.
+        rows : np.ndarray
+            The new rows, oldest first. Rows already overwritten are lost.
+        total : int
+            The cursor to pass on the next call.
+        """
+        with self._lock:
+            n = max(min(self._write_idx - cursor, len(self)), 0)
+            return list(self.columns), self._ordered(n), self._write_idx
+
+    def _grow(self):
+        new_rows = min(self._buf.shape[0] * 2, self.capacity)
+        grown = np.full((new_rows, self._buf.shape[1]), np.nan, dtype=self.dtype)
+        grown[: self._buf.shape[0]] = self._buf
+        self._buf = grown
+
+    def _ordered(self, n: int) -> np.ndarray:
+        """Return a chronological copy of the last n rows. Caller holds the lock."""
+        rows = self._buf.shape[0]
+        n = min(n, len(self))
+        end = self._write_idx % rows
+        start = end - n
+        if start >= 0:
+            return self._buf[start:end].copy()
+        return np.concatenate((self._buf[start:], self._buf[:end]))
+
+    def tail(self, n: int) -> np.ndarray:
+        """Return the last n rows (oldest first) as a 2D array."""
+        with self._lock:
+            return self._ordered(n)
+
+    def latest(self, name: str, default=np.nan):
+        """Return the most recent value of a column, or default if empty/unknown."""
+        col = self._index.get(name)
+        with self._lock:
+            if col is None or self._write_idx == 0:
+                return default
+            return self._buf[(self._write_idx - 1) % self._buf.shape[0], col]
+
+    def tail_since(self, name: str, cutoff: float) -> np.ndarray:
+        """
+        Return the trailing rows whose value in column ``name`` is >= cutoff.
+
+        The column must be non-decreasing in append order (e.g. ``time_s``),
+        which lets the boundary be found with a binary search on each of the
+        two contiguous segments of the ring instead of a Python-level walk.
+        """
+        col = self._index[name]
+        with self._lock:
+            size = len(self)
+            if size == 0:
+                return np.empty((0, len(self.columns)), dtype=self.dtype)
+            rows = self._buf.shape[0]
+            end = self._write_idx % rows
+            if size < rows or end == 0:
+                start = end - size if end else rows - size
+                seg = self._buf[start:start + size, col]
+                n = size - int(np.searchsorted(seg, cutoff, side="left"))
+            else:
+                newer = self._buf[:end, col]
+                older = self._buf[end:, col]
+                if newer.size and newer[0] >= cutoff:
+                    n = newer.size + older.size - int(np.searchsorted(older, cutoff, side="left"))
+                else:
+                    n = newer.size - int(np.searchsorted(newer, cutoff, side="left"))
+            return self._ordered(n)
@@ -1,3 +1,3 @@
 from .video_worker import VideoWorker, ProcessingWorker
-from .ir_worker import IRWorker
+from .ir_worker import IRWorker, OPTRIS_LIB_LOADED
 from .video_recorder import VideoRecorder
\ No newline at end of file
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test: autosave writers used while recording.
+
+Validates:
+  1. CSV writer output round-trips through read_autosave(), across several chunks
+  2. Arrow writer flushes in chunks and round-trips (skipped without pyarrow)
+  3. an Arrow file that was never closed is still readable up to the last batch
+  4. "arrow" falls back to CSV when pyarrow is missing
+  5. a writer subclass without _write_chunk fails when created, not at the first flush
+
+Usage:
+    python test/test_autosave.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from HEPiC.utils import autosave
+from HEPiC.utils.autosave import open_autosave_writer, read_autosave
+
+COLUMNS = ["time_s", "extrusion_force_N"]
+
+
+class TestCsvAutosave(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = open_autosave_writer(Path(tmp) / "run_autosave", COLUMNS, "csv")
+            self.assertEqual(writer.path.suffix, ".csv")
+            writer.write_row([0.0, 1.5])
+            writer.write_row([0.1, float("nan")])
+            writer.close()
+
+            df = read_autosave(writer.path)
+            self.assertEqual(list(df.columns), COLUMNS)
+            self.assertEqual(df["extrusion_force_N"].iloc[0], 1.5)
+            self.assertTrue(np.isnan(df["extrusion_force_N"].iloc[1]))
+
+    def test_chunks_keep_row_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = open_autosave_writer(Path(tmp) / "run_autosave", COLUMNS, "csv", chunk_rows=4)
+            for i in range(10):
+                writer.write_row([1000.0 + i * 0.02, float(i)])
+            writer.close()
+
+            df = read_autosave(writer.path)
+            np.testing.assert_array_equal(df["extrusion_force_N"].to_numpy(), np.arange(10.0))
+            np.testing.assert_allclose(df["time_s"].to_numpy(), 1000.0 + np.arange(10) * 0.02)
+
+    def test_arrow_falls_back_to_csv_without_pyarrow(self):
+        with tempfile.TemporaryDirectory() as tmp, patch.object(autosave, "PYARROW_AVAILABLE", False):
+            writer = open_autosave_writer(Path(tmp) / "run_autosave", COLUMNS, "arrow")
+            writer.close()
+            self.assertEqual(writer.path.suffix, ".csv")
+
+    def test_writer_without_write_chunk_cannot_be_created(self):
+        class IncompleteWriter(autosave._ChunkedAutosaveWriter):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteWriter(Path("unused"), COLUMNS)
+
+
+@unittest.skipUnless(autosave.PYARROW_AVAILABLE, "pyarrow not installed")
+class TestArrowAutosave(unittest.TestCase):
+    def test_round_trip_with_partial_chunk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = open_autosave_writer(Path(tmp) / "run_autosave", COLUMNS, "arrow", chunk_rows=4)
+            self.assertEqual(writer.path.suffix, ".arrows")
+            for i in range(10):
+                writer.write_row([i * 0.1, float(i)])
+            writer.close()
+
+            df = read_autosave(writer.path)
+            self.assertEqual(list(df.columns), COLUMNS)
+            np.testing.assert_array_equal(df["extrusion_force_N"].to_numpy(), np.arange(10.0))
+
+    def test_unclosed_file_keeps_flushed_batches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = open_autosave_writer(Path(tmp) / "run_autosave", COLUMNS, "arrow", chunk_rows=4)
+            for i in range(6):
+                writer.write_row([i * 0.1, float(i)])
+            # simulate a crash: the sink is flushed but the stream is never closed
+            writer._sink.flush()
+
+            df = read_autosave(writer.path)
+            np.testing.assert_array_equal(df["extrusion_force_N"].to_numpy(), np.arange(4.0))
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    result = runner.run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test: GcodePositionMapper, which maps Klipper's file_position (a byte
+offset) back to a G-code line number.
+
+Validates:
+  1. line offsets are counted in UTF-8 bytes, not characters
+  2. str and raw bytes input build the same map
+  3. positions past the end clamp to the last line
+
+Usage:
+    python test/test_gcode_position_mapper.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from HEPiC.utils.gcode_position_mapper import GcodePositionMapper
+
+
+GCODE = "G91\n; 注释：你好\nG1 E1 F100\nM104 S200"
+
+
+class TestGcodePositionMapper(unittest.TestCase):
+    def test_offsets_are_utf8_bytes(self):
+        mapper = GcodePositionMapper(GCODE)
+        # "; 注释：你好\n" is 2 + 5 * 3 + 1 = 18 bytes
+        self.assertEqual(mapper.line_start_offsets, [0, 4, 22, 33])
+        self.assertEqual(mapper.total_lines, 4)
+        self.assertEqual(mapper.total_bytes, len(GCODE.encode("utf-8")))
+
+    def test_bytes_input_matches_str_input(self):
+        from_str = GcodePositionMapper(GCODE)
+        from_bytes = GcodePositionMapper(GCODE.encode("utf-8"))
+        self.assertEqual(from_bytes.line_start_offsets, from_str.line_start_offsets)
+        self.assertEqual(from_bytes.total_bytes, from_str.total_bytes)
+
+    def test_get_line_number(self):
+        mapper = GcodePositionMapper(GCODE)
+        self.assertEqual(mapper.get_line_number(0), 1)
+        self.assertEqual(mapper.get_line_number(21), 2)
+        self.assertEqual(mapper.get_line_number(22), 3)
+        self.assertEqual(mapper.get_line_number(10_000), 4)
+        self.assertEqual(mapper.get_line_number(-5), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
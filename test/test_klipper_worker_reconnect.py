@@ -8,7 +8,8 @@ spurious reconnects or leaked tasks:
 
   K1. A malformed / unexpectedly-shaped server message must NOT crash
       data_processor (which would tear down a healthy connection).
-  K2. stop() must cancel query_task (no task leak on shutdown).
+  K2. stop() must cancel query_task (no task leak on shutdown) and make run()
+      return at once, even from the reconnect backoff wait.
   K3. Reconnect uses exponential backoff with a cap and resets on success.
 
 Plus baseline integration checks that genuine drops DO reconnect.
@@ -28,7 +29,7 @@ import websockets
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from HEPiC.communications.klipper_worker import KlipperWorker
+from HEPiC.communications.klipper_worker import KlipperWorker, _is_ignored_notification
 
 
 # ---------------------------------------------------------------------------
@@ -41,7 +42,7 @@ def _raw_run(worker: KlipperWorker):
 
 
 class FakeWebSocket:
-    """Minimal stand-in for a websocket connection used by data_processor."""
+    """Minimal stand-in for a websocket connection used by message_writer."""
 
     def __init__(self):
         self.sent: list[str] = []
@@ -132,21 +133,20 @@ class ControllableMoonraker:
 
 class TestDataProcessorRobustness(unittest.IsolatedAsyncioTestCase):
     async def _run_processor_with(self, *messages):
-        """Feed messages into a live data_processor task; return (worker, task, ws)."""
+        """Feed messages into a live data_processor task; return (worker, task)."""
         worker = KlipperWorker("127.0.0.1", 1)
-        ws = FakeWebSocket()
-        task = asyncio.create_task(worker.data_processor(ws))
+        task = asyncio.create_task(worker.data_processor())
         for msg in messages:
             await worker.message_queue.put(msg)
         # Give the processor time to consume everything.
         await asyncio.sleep(0.2)
-        return worker, task, ws
+        return worker, task
 
     async def asyncTearDown(self):
         pass
 
     async def test_notify_gcode_response_missing_params_does_not_crash(self):
-        worker, task, ws = await self._run_processor_with(
+        worker, task = await self._run_processor_with(
             {"method": "notify_gcode_response"},  # no "params" -> None[0]
             {"method": "printer.objects.query"},  # valid follow-up proves liveness
         )
@@ -154,7 +154,7 @@ class TestDataProcessorRobustness(unittest.IsolatedAsyncioTestCase):
         task.cancel()
 
     async def test_notify_gcode_response_empty_params_does_not_crash(self):
-        worker, task, ws = await self._run_processor_with(
+        worker, task = await self._run_processor_with(
             {"method": "notify_gcode_response", "params": []},  # IndexError
             {"method": "printer.objects.query"},
         )
@@ -162,7 +162,7 @@ class TestDataProcessorRobustness(unittest.IsolatedAsyncioTestCase):
         task.cancel()
 
     async def test_error_message_missing_fields_does_not_crash(self):
-        worker, task, ws = await self._run_processor_with(
+        worker, task = await self._run_processor_with(
             {"error": {}},  # data["error"]["code"] -> KeyError
             {"method": "printer.objects.query"},
         )
@@ -170,19 +170,106 @@ class TestDataProcessorRobustness(unittest.IsolatedAsyncioTestCase):
         task.cancel()
 
     async def test_processor_still_processes_after_bad_message(self):
-        """A valid query after a bad message must still be forwarded to the socket."""
-        worker, task, ws = await self._run_processor_with(
+        """A valid query result after a bad message must still be applied."""
+        worker, task = await self._run_processor_with(
             {"method": "notify_gcode_response"},   # bad
-            {"method": "printer.objects.query"},   # good -> should be sent
+            {"id": 2, "result": {"status": {"extruder": {"temperature": 200.0}}}},  # good
         )
         self.assertFalse(task.done())
-        self.assertTrue(
-            any("printer.objects.query" in m for m in ws.sent),
-            f"valid message after a bad one was not processed; sent={ws.sent}",
+        self.assertEqual(
+            worker.hotend_temperature, 200.0,
+            "valid message after a bad one was not processed",
         )
         task.cancel()
 
 
+class TestOutboundSend(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        if getattr(self, "writer", None):
+            self.writer.cancel()
+
+    def _connect(self, worker, websocket):
+        worker._websocket = websocket
+        self.writer = asyncio.create_task(worker.message_writer(websocket))
+
+    async def test_requests_go_through_the_writer(self):
+        worker = KlipperWorker("127.0.0.1", 1)
+        self._connect(worker, FakeWebSocket())
+        worker.send_gcode("G28")  # plain call, no coroutine per request
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(worker._websocket.sent), 1)
+        self.assertEqual(json.loads(worker._websocket.sent[0])["params"]["script"], "G28")
+        self.assertTrue(worker.message_queue.empty())
+
+    async def test_queries_queued_during_a_send_are_batched(self):
+        class SlowWebSocket(FakeWebSocket):
+            async def send(self, message: str):
+                await asyncio.sleep(0.05)
+                self.sent.append(message)
+
+        worker = KlipperWorker("127.0.0.1", 1)
+        self._connect(worker, SlowWebSocket())
+        worker._send({"method": "printer.objects.query", "id": 0}, batchable=True)
+        await asyncio.sleep(0.01)  # writer is now inside send()
+        worker._send({"method": "printer.objects.query", "id": 1}, batchable=True)
+        worker._send({"method": "printer.objects.subscribe", "id": 2}, batchable=True)
+        await asyncio.sleep(0.2)
+        frames = [json.loads(m) for m in worker._websocket.sent]
+        self.assertEqual(frames[0]["id"], 0)
+        self.assertEqual([req["id"] for req in frames[1]], [1, 2])
+
+    async def test_gcode_is_never_batched(self):
+        """A slow gcode.script in an array would hold back every request batched with it."""
+        class SlowWebSocket(FakeWebSocket):
+            async def send(self, message: str):
+                await asyncio.sleep(0.05)
+                self.sent.append(message)
+
+        worker = KlipperWorker("127.0.0.1", 1)
+        self._connect(worker, SlowWebSocket())
+        worker._send({"method": "printer.objects.query", "id": 0}, batchable=True)
+        await asyncio.sleep(0.01)
+        worker.send_gcode("M109 S200")
+        worker._send({"method": "printer.objects.query", "id": 2}, batchable=True)
+        await asyncio.sleep(0.3)
+        frames = [json.loads(m) for m in worker._websocket.sent]
+        self.assertEqual(len(frames), 3)
+        self.assertTrue(all(isinstance(f, dict) for f in frames))
+        self.assertEqual([f["id"] for f in frames], [0, 3, 2])
+
+    async def test_emergency_stop_is_sent_at_once_as_its_own_frame(self):
+        class SlowGcodeWebSocket(FakeWebSocket):
+            async def send(self, message: str):
+                if "printer.gcode.script" in message:
+                    await asyncio.sleep(0.3)  # e.g. a long M109 write
+                self.sent.append(message)
+
+        worker = KlipperWorker("127.0.0.1", 1)
+        self._connect(worker, SlowGcodeWebSocket())
+        worker.send_gcode("M109 S200")
+        await asyncio.sleep(0.01)  # writer is now inside the slow send
+        for i in range(300):  # a full outbox must not drop the stop request
+            worker._send({"method": "printer.objects.query", "id": i}, batchable=True)
+        worker.emergency_stop()
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(worker._websocket.sent), 1)
+        frame = json.loads(worker._websocket.sent[0])
+        self.assertIsInstance(frame, dict)
+        self.assertEqual(frame["method"], "printer.emergency_stop")
+
+    async def test_send_without_connection_is_dropped(self):
+        worker = KlipperWorker("127.0.0.1", 1)
+        worker._send({"method": "printer.objects.query"})  # must not raise
+        self.assertEqual(worker._outbox, [])
+
+    async def test_outbox_is_bounded(self):
+        worker = KlipperWorker("127.0.0.1", 1)
+        worker._websocket = FakeWebSocket()  # no writer: nothing drains the outbox
+        for i in range(300):
+            worker._send({"method": "printer.objects.query", "id": i}, batchable=True)
+        self.assertEqual(len(worker._outbox), 256)
+
+
 # ---------------------------------------------------------------------------
 # K3: exponential reconnect backoff (pure logic, no I/O)
 # ---------------------------------------------------------------------------
@@ -205,6 +292,25 @@ class TestReconnectBackoff(unittest.TestCase):
         self.assertEqual(worker._next_reconnect_delay(), 1.0)
 
 
+# ---------------------------------------------------------------------------
+# Pre-parse filter: only notifications the worker never acts on are skipped
+# ---------------------------------------------------------------------------
+
+class TestNotificationFilter(unittest.TestCase):
+    def test_skips_unused_notifications(self):
+        msg = json.dumps({"jsonrpc": "2.0", "method": "notify_proc_stat_update", "params": [{}]})
+        self.assertTrue(_is_ignored_notification(msg))
+        self.assertTrue(_is_ignored_notification(msg.encode()))
+
+    def test_keeps_messages_the_worker_handles(self):
+        for data in (
+            {"jsonrpc": "2.0", "method": "notify_gcode_response", "params": ["ok"]},
+            {"jsonrpc": "2.0", "id": 2, "result": {"status": {}}},
+            {"jsonrpc": "2.0", "id": 3, "error": {"code": 400, "message": "bad"}},
+        ):
+            self.assertFalse(_is_ignored_notification(json.dumps(data)))
+
+
 # ---------------------------------------------------------------------------
 # Integration: reconnect against a controllable mock Moonraker server
 # ---------------------------------------------------------------------------
@@ -297,6 +403,22 @@ class TestQueryTaskLifecycle(unittest.IsolatedAsyncioTestCase):
             "query_task leaked: still running after stop()",
         )
 
+    async def test_stop_exits_run_promptly(self):
+        """stop() wakes run() through the stop event instead of waiting for a poll."""
+        await self.server.wait_for_connection(1)
+        self.worker.stop()
+        await asyncio.wait_for(self.run_task, timeout=1.0)
+        self.assertFalse(self.worker.is_running)
+
+    async def test_stop_interrupts_reconnect_wait(self):
+        """stop() during the reconnect backoff must not wait out the delay."""
+        await self.server.wait_for_connection(1)
+        self.worker.reconnect_base_delay = 30.0
+        await self.server.drop_latest()
+        await asyncio.sleep(0.3)  # run() is now inside the backoff wait
+        self.worker.stop()
+        await asyncio.wait_for(self.run_task, timeout=1.0)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
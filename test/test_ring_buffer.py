@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test: RingBuffer, the column-oriented NumPy buffer behind MainWindow.data.
+
+Validates:
+  1. rows come back in chronological order before and after wrap-around
+  2. storage grows lazily up to capacity
+  3. tail_since() finds the time-window boundary across the wrap point
+  4. columns added later are back-filled with nan
+
+Usage:
+    python test/test_ring_buffer.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from HEPiC.utils.ring_buffer import RingBuffer
+
+
+class TestRingBufferOrdering(unittest.TestCase):
+    def test_tail_before_wrap(self):
+        buf = RingBuffer(["time_s", "force"], capacity=10)
+        for i in range(4):
+            buf.append([i, i * 10])
+        self.assertEqual(len(buf), 4)
+        np.testing.assert_array_equal(buf.tail(2), [[2, 20], [3, 30]])
+
+    def test_tail_after_wrap(self):
+        buf = RingBuffer(["time_s"], capacity=5)
+        for i in range(12):
+            buf.append([i])
+        self.assertEqual(len(buf), 5)
+        self.assertEqual(buf.total, 12)
+        np.testing.assert_array_equal(buf.tail(5)[:, 0], [7, 8, 9, 10, 11])
+        self.assertEqual(buf.latest("time_s"), 11)
+
+    def test_storage_grows_up_to_capacity(self):
+        buf = RingBuffer(["time_s"], capacity=10_000)
+        self.assertLess(buf._buf.shape[0], 10_000)
+        for i in range(9_000):
+            buf.append([i])
+        self.assertLessEqual(buf._buf.shape[0], 10_000)
+        np.testing.assert_array_equal(buf.tail(3)[:, 0], [8_997, 8_998, 8_999])
+
+
+class TestRingBufferTimeWindow(unittest.TestCase):
+    def test_tail_since_without_wrap(self):
+        buf = RingBuffer(["time_s", "v"], capacity=100)
+        for i in range(10):
+            buf.append([i * 0.5, i])
+        window = buf.tail_since("time_s", 3.0)
+        np.testing.assert_array_equal(window[:, 0], [3.0, 3.5, 4.0, 4.5])
+
+    def test_tail_since_across_wrap(self):
+        buf = RingBuffer(["time_s"], capacity=8)
+        for i in range(13):
+            buf.append([float(i)])
+        # live rows are 5..12, wrap point sits between 7 and 8
+        np.testing.assert_array_equal(buf.tail_since("time_s", 6.0)[:, 0], np.arange(6, 13))
+        np.testing.assert_array_equal(buf.tail_since("time_s", 10.0)[:, 0], [10, 11, 12])
+        np.testing.assert_array_equal(buf.tail_since("time_s", 0.0)[:, 0], np.arange(5, 13))
+
+    def test_tail_since_empty(self):
+        buf = RingBuffer(["time_s"], capacity=8)
+        self.assertEqual(len(buf.tail_since("time_s", 0.0)), 0)
+        self.assertTrue(np.isnan(buf.latest("time_s")))
+
+
+class TestRingBufferColumns(unittest.TestCase):
+    def test_added_column_is_nan_backfilled(self):
+        buf = RingBuffer(["time_s"], capacity=10)
+        buf.append([0.0])
+        self.assertTrue(buf.add_columns(["time_s", "die_diameter_px"]))
+        self.assertFalse(buf.add_columns(["die_diameter_px"]))
+        buf.append([1.0, 42.0])
+        rows = buf.tail(2)
+        self.assertTrue(np.isnan(rows[0, 1]))
+        self.assertEqual(rows[1, 1], 42.0)
+
+    def test_short_row_is_padded(self):
+        buf = RingBuffer(["time_s", "force"], capacity=10)
+        buf.append([1.0])
+        self.assertTrue(np.isnan(buf.latest("force")))
+
+
+class TestRingBufferDelta(unittest.TestCase):
+    def test_rows_since_returns_only_new_rows(self):
+        buf = RingBuffer(["time_s"], capacity=8)
+        for i in range(3):
+            buf.append([float(i)])
+        columns, rows, cursor = buf.rows_since(0)
+        self.assertEqual(columns, ["time_s"])
+        np.testing.assert_array_equal(rows[:, 0], [0, 1, 2])
+        buf.append([3.0])
+        _, rows, cursor = buf.rows_since(cursor)
+        np.testing.assert_array_equal(rows[:, 0], [3])
+        _, rows, _ = buf.rows_since(cursor)
+        self.assertEqual(len(rows), 0)
+
+    def test_extend_wraps_like_append(self):
+        by_row = RingBuffer(["time_s", "force"], capacity=8)
+        by_block = RingBuffer(["time_s", "force"], capacity=8)
+        block = np.column_stack([np.arange(13.0), np.arange(13.0) * 2])
+        for row in block:
+            by_row.append(row)
+        by_block.extend(block[:5])
+        by_block.extend(block[5:])
+        np.testing.assert_array_equal(by_row.tail(8), by_block.tail(8))
+        self.assertEqual(by_block.total, 13)
+
+    def test_extend_larger_than_capacity(self):
+        buf = RingBuffer(["time_s"], capacity=4)
+        buf.extend(np.arange(10.0).reshape(-1, 1))
+        np.testing.assert_array_equal(buf.tail(4)[:, 0], [6, 7, 8, 9])
+        self.assertEqual(buf.latest("time_s"), 9.0)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    result = runner.run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -5,7 +5,7 @@ Test: TCPClient reconnect behavior.
 Validates three bug fixes:
   1. send failure no longer sets is_running=False and kills the reconnect loop
   2. null sensor values from server become nan instead of crashing sensor.update()
-  3. stale queue items from the old connection are cleared before each reconnect
+  3. stale readings from the old connection are cleared before each reconnect
 
 Usage:
     python test/test_tcp_client_reconnect.py
@@ -16,13 +16,13 @@ import json
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from HEPiC.communications.tcp_client import SensorData, TCPClient
+from HEPiC.communications.tcp_client import SensorData, TCPClient, _LineProtocol
 
 
 # ---------------------------------------------------------------------------
@@ -143,6 +143,16 @@ class TestSensorDataNullHandling(unittest.TestCase):
         sensor.update(5.0)
         self.assertEqual(sensor.raw_value, 5.0)
 
+    def test_zero_requires_a_reading(self):
+        sensor = SensorData(name="force", can_zero=True)
+        self.assertFalse(sensor.zero(), "nothing to zero before the first reading")
+        sensor.update(3.0)
+        self.assertTrue(sensor.zero())
+        self.assertEqual(sensor.offset, 3.0)
+        sensor.update(None)
+        self.assertFalse(sensor.zero(), "a null reading must not become the new offset")
+        self.assertEqual(sensor.offset, 3.0)
+
 
 # ---------------------------------------------------------------------------
 # Test: send failure does NOT kill is_running (no server needed)
@@ -257,6 +267,128 @@ class TestReconnectBackoff(unittest.TestCase):
         self.assertEqual(client._next_reconnect_delay(), 1.0)
 
 
+# ---------------------------------------------------------------------------
+# Test: zeroability is resolved from sensor_config (no server needed)
+# ---------------------------------------------------------------------------
+
+class TestZeroableSensors(unittest.TestCase):
+    def test_config_after_data_marks_existing_sensor_zeroable(self):
+        client = TCPClient("h", 1)
+        client._handle_message({"message_type": "sensor_data", "payload": {"force": 1.0}})
+        self.assertEqual(client.get_zeroable_sensor_names(), [])
+
+        config = {"sensors": [{"name": "force", "zeroable": True}, {"name": "temp"}]}
+        client._handle_message({"message_type": "sensor_config", "payload": config})
+        self.assertEqual(client.get_zeroable_sensor_names(), ["force"])
+        self.assertFalse(client.sensor_data_map["temp"].can_zero)
+
+
+# ---------------------------------------------------------------------------
+# Test: NaN literal from the server's json.dumps (no server needed)
+# ---------------------------------------------------------------------------
+
+class TestNaNLiteral(unittest.TestCase):
+    def test_nan_reading_does_not_drop_the_frame(self):
+        client = TCPClient("h", 1)
+        client._on_line(bytearray(
+            b'{"message_type": "sensor_data", "payload": {"force": NaN, "temp": 200.5}}'
+        ))
+        self.assertTrue(np.isnan(client.latest_sensor_data["force"]))
+        self.assertEqual(client.latest_sensor_data["temp"], 200.5)
+        self.assertFalse(client.sensor_data_map["force"].has_value)
+
+
+# ---------------------------------------------------------------------------
+# Test: filament velocity over the meter_count window (no server needed)
+# ---------------------------------------------------------------------------
+
+class TestFilamentVelocity(unittest.TestCase):
+    def test_velocity_over_full_window(self):
+        client = TCPClient("h", 1, meter_count_cache_size=3)
+        t = iter([0, 500_000_000, 1_000_000_000, 1_500_000_000, 2_000_000_000])
+        with patch("HEPiC.communications.tcp_client.time.monotonic_ns", lambda: next(t)):
+            velocities = []
+            for count in (0.0, 1.0, 2.0, 4.0, 6.0):
+                client.meter_count = count
+                client.compute_filament_velocity()
+                velocities.append(client.filament_velocity)
+        # window not full yet -> 0; then (newest - oldest) / 1.0 s
+        self.assertEqual(velocities, [0.0, 0.0, 2.0, 3.0, 4.0])
+
+
+# ---------------------------------------------------------------------------
+# Test: newline framing in the protocol (no server needed)
+# ---------------------------------------------------------------------------
+
+class TestLineFraming(unittest.IsolatedAsyncioTestCase):
+    async def test_lines_split_across_and_within_chunks(self):
+        lines = []
+        protocol = _LineProtocol(lambda line: lines.append(bytes(line)))
+        protocol.data_received(b'{"a": 1}\n{"b"')
+        protocol.data_received(b': 2}')
+        protocol.data_received(b'\n{"c": 3}\n{"d": 4}\n')
+        self.assertEqual(lines, [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}', b'{"d": 4}'])
+
+    async def test_partial_frame_is_not_rescanned(self):
+        lines = []
+        protocol = _LineProtocol(lambda line: lines.append(bytes(line)))
+        for _ in range(100):
+            protocol.data_received(b"x" * 50)
+        self.assertEqual(protocol._scan_pos, 5000)
+        protocol.data_received(b"x\nyz")
+        self.assertEqual(lines, [b"x" * 5001])
+        self.assertEqual(protocol._scan_pos, 2)
+
+    async def test_overlong_line_closes_connection(self):
+        lines = []
+        protocol = _LineProtocol(lambda line: lines.append(bytes(line)), max_line_length=100)
+        protocol.transport = MagicMock()
+        protocol.data_received(b'{"a": 1}\n' + b"x" * 60)
+        protocol.transport.close.assert_not_called()
+        protocol.data_received(b"x" * 60)
+        protocol.transport.close.assert_called_once()
+        self.assertEqual(lines, [b'{"a": 1}'])
+        self.assertEqual(len(protocol._buf), 0)
+
+
+# ---------------------------------------------------------------------------
+# Test: concurrent drain() callers while writing is paused (no server needed)
+# ---------------------------------------------------------------------------
+
+class TestConcurrentDrain(unittest.IsolatedAsyncioTestCase):
+    async def test_resume_wakes_every_waiter(self):
+        protocol = _LineProtocol(lambda line: None)
+        protocol.pause_writing()
+        first = asyncio.create_task(protocol.drain())
+        second = asyncio.create_task(protocol.drain())
+        await asyncio.sleep(0)
+        protocol.resume_writing()
+        await asyncio.wait_for(asyncio.gather(first, second), timeout=1.0)
+        self.assertEqual(len(protocol._drain_waiters), 0)
+
+    async def test_timed_out_waiter_is_removed(self):
+        protocol = _LineProtocol(lambda line: None)
+        protocol.pause_writing()
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(protocol.drain(), timeout=0.05)
+        self.assertEqual(len(protocol._drain_waiters), 0)
+
+
+# ---------------------------------------------------------------------------
+# Test: stop() during the reconnect backoff
+# ---------------------------------------------------------------------------
+
+class TestStopDuringBackoff(unittest.IsolatedAsyncioTestCase):
+    async def test_stop_interrupts_reconnect_wait(self):
+        """stop() must end run() without waiting out the backoff delay."""
+        client = TCPClient("127.0.0.1", 1, reconnect_base_delay=30.0)  # nothing listens on port 1
+        task = asyncio.create_task(client.run())
+        await asyncio.sleep(0.3)  # connect refused, run() is in the backoff wait
+        client.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+        self.assertFalse(client.is_running)
+
+
 # ---------------------------------------------------------------------------
 # Integration tests: reconnect with a live mock server
 # ---------------------------------------------------------------------------
@@ -350,31 +482,28 @@ class TestReconnectIntegration(unittest.IsolatedAsyncioTestCase):
             f"meter should be nan or absent for null payload, got {meter_val!r}",
         )
 
-    async def test_stale_queue_cleared_before_reconnect(self):
-        """Items left in queue from old connection must not appear in new session."""
+    async def test_stale_values_cleared_before_reconnect(self):
+        """Readings from the old connection must not survive into the new session."""
         await self.server.wait_for_connection(1)
         await self.server.send(_sensor_config_msg(["force"]))
+        await self.server.send(_sensor_data_msg({"force": 999.0}))
+        await self._wait_for_value("force", 999.0)
 
-        # Inject stale items with a value that must never survive into the new session.
-        stale = {"message_type": "sensor_data", "payload": {"force": 999.0}}
-        for _ in range(5):
-            await self.client.queue.put(stale)
-
-        # Drop → triggers cleanup and queue flush in run().
+        # Drop → run() invalidates sensor data while disconnected.
         await self.server.drop_latest()
+        await self._wait_for_value("force", np.nan)
 
-        # Allow extra time: process_task drains stale items before suspending,
-        # which slightly delays EOF delivery to receive_task on loopback.
-        await self.server.wait_for_connection(2, timeout=12.0)
-
-        # Send fresh data on the new connection.
+        await self.server.wait_for_connection(2, timeout=7.0)
         await self.server.send(_sensor_config_msg(["force"]))
         await self.server.send(_sensor_data_msg({"force": 2.22}))
-
-        # If stale queue wasn't cleared, the 999.0 backlog would block or corrupt
-        # the fresh value. Receiving 2.22 proves the queue was flushed cleanly.
         await self._wait_for_value("force", 2.22, timeout=3.0)
 
+    async def test_silent_server_triggers_reconnect(self):
+        """No data for read_timeout must recycle the connection."""
+        self.client.read_timeout = 0.3
+        await self.server.wait_for_connection(1)
+        await self.server.wait_for_connection(2, timeout=4.0)
+
     async def test_multiple_reconnects_keep_working(self):
         """Client should keep reconnecting through repeated drops."""
         for cycle in range(3):